@@ -1,23 +1,157 @@
-from django.contrib import admin
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.views.main import ChangeList
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.html import format_html
 
-from .models import Post, Category, Location, Comment
+from .models import Post, Category, Location, Comment, ImageJob
+from .moderation import moderate
+from .paginators import EstimatedCountPaginator
+from .search import search_posts
 
 
-class PostInline(admin.StackedInline):
+class LoadOnlyChangeList(ChangeList):
+    """Список объектов, загружающий только поля из list_only.
+
+    Строки с list_editable сохраняются, а save() объекта с отложенными
+    полями пишет только загруженные: updated_at из touch_post и поля,
+    которые читают сигналы, потерялись бы. Такие списки грузятся целиком.
+    """
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.model_admin.list_only and not self.list_editable:
+            queryset = queryset.only(*self.model_admin.list_only)
+        return queryset
+
+
+class ModerationActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        Category.objects.all(),
+        required=False,
+        label='Категория',
+    )
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Админка таблиц на сотни тысяч строк: без COUNT(*) всей таблицы.
+
+    Стандартное удаление выбранных заменено пакетным: delete_selected
+    загружает и показывает все связанные объекты.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_only = ()
+
+    def get_changelist(self, request, **kwargs):
+        return LoadOnlyChangeList
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def moderate(self, request, queryset, action, category=None):
+        rows, seconds = moderate(queryset, action, category)
+        self.message_user(
+            request,
+            f'Обработано строк: {rows} за {seconds:.1f} с '
+            f'({rows / max(seconds, 1e-9):.0f} строк/с).',
+            messages.SUCCESS,
+        )
+
+
+class LatestPostsFormSet(BaseInlineFormSet):
+    """Только последние ADMIN_INLINE_POSTS объектов вместо всех."""
+
+    def get_queryset(self):
+        if not hasattr(self, '_latest'):
+            self._latest = list(
+                super().get_queryset()[:settings.ADMIN_INLINE_POSTS])
+        return self._latest
+
+
+class PostInline(admin.TabularInline):
     model = Post
+    formset = LatestPostsFormSet
+    fields = ('title', 'author', 'pub_date', 'is_published')
     extra = 0
+    show_change_link = True
+    verbose_name_plural = 'Последние публикации'
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author')
+
+    # Только просмотр: формы инлайна не проверяются при сохранении
+    # категории.
+    def has_add_permission(self, request, obj=None):
+        return False
 
+    def has_change_permission(self, request, obj=None):
+        return False
 
-class PostAdmin(admin.ModelAdmin):
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+class PostAdmin(LargeTableAdmin):
     list_display = (
         'title',
         'category',
+        'author',
+        'pub_date',
         'is_published'
     )
-    list_editable = ('is_published', 'category')
+    list_editable = ('is_published',)
+    list_select_related = ('category', 'author')
     search_fields = ('title',)
     list_filter = ('is_published',)
     list_display_links = ('title',)
+    autocomplete_fields = ('author', 'category', 'location')
+    action_form = ModerationActionForm
+    actions = (
+        'publish_posts',
+        'unpublish_posts',
+        'recategorize_posts',
+        'delete_posts',
+    )
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
+    @admin.action(description='Опубликовать', permissions=('change',))
+    def publish_posts(self, request, queryset):
+        self.moderate(request, queryset, 'publish')
+
+    @admin.action(description='Снять с публикации', permissions=('change',))
+    def unpublish_posts(self, request, queryset):
+        self.moderate(request, queryset, 'unpublish')
+
+    @admin.action(
+        description='Перенести в выбранную категорию',
+        permissions=('change',),
+    )
+    def recategorize_posts(self, request, queryset):
+        try:
+            category = self.action_form.base_fields['category'].clean(
+                request.POST.get('category'))
+        except forms.ValidationError:
+            category = None
+        if category is None:
+            self.message_user(
+                request, 'Выберите категорию.', messages.ERROR)
+            return
+        self.moderate(request, queryset, 'recategorize', category)
+
+    @admin.action(description='Удалить пакетами', permissions=('delete',))
+    def delete_posts(self, request, queryset):
+        self.moderate(request, queryset, 'delete')
 
 
 class CategoryAdmin(admin.ModelAdmin):
@@ -31,22 +165,62 @@ class CategoryAdmin(admin.ModelAdmin):
     list_editable = (
         'is_published',
     )
+    readonly_fields = ('all_posts',)
     search_fields = ('title',)
+    ordering = ('title',)
     list_filter = ('is_published',)
     list_display_links = ('title',)
 
+    @admin.display(description='Публикации')
+    def all_posts(self, category):
+        if category.pk is None:
+            return '—'
+        url = reverse('admin:blog_post_changelist')
+        return format_html(
+            '<a href="{}?category__id__exact={}">Все публикации категории</a>',
+            url,
+            category.pk,
+        )
+
+
+class LocationAdmin(admin.ModelAdmin):
+    search_fields = ('name',)
+    ordering = ('name',)
 
-class CommentAdmin(admin.ModelAdmin):
+
+class CommentAdmin(LargeTableAdmin):
     list_display = (
         'text',
         'created_at',
         'author',
     )
+    list_select_related = ('author',)
+    list_only = ('text', 'created_at', 'author__username')
+    ordering = ('-created_at',)
     search_fields = ('text',)
     list_display_links = ('text',)
+    raw_id_fields = ('post', 'author')
+    actions = ('delete_comments',)
+
+    @admin.action(description='Удалить пакетами', permissions=('delete',))
+    def delete_comments(self, request, queryset):
+        self.moderate(request, queryset, 'delete')
+
+
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'post',
+        'status',
+        'attempts',
+        'updated_at',
+    )
+    list_filter = ('status',)
+    list_select_related = ('post',)
+    raw_id_fields = ('post',)
 
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Category, CategoryAdmin)
-admin.site.register(Location)
+admin.site.register(Location, LocationAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(ImageJob, ImageJobAdmin)
@@ -0,0 +1,137 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.paginator import InvalidPage
+from django.http import Http404, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views.generic import View
+
+from .freshness import (
+    category_freshness,
+    feed_freshness,
+    post_freshness,
+    profile_freshness,
+)
+from .lookups import get_category_or_404, get_profile_or_404
+from .models import Post
+from .paginators import CursorPaginator
+from .query_utils import (
+    get_comments_page,
+    get_visible_post_or_404,
+    published_filter,
+)
+
+POST_FIELDS = (
+    'id',
+    'title',
+    'text',
+    'pub_date',
+    'image',
+    'comment_count',
+    'author__username',
+    'category__slug',
+    'category__title',
+    'location__name',
+    'location__is_published',
+)
+
+
+def serialize_post(values):
+    return {
+        'id': values['id'],
+        'title': values['title'],
+        'text': values['text'],
+        'pub_date': values['pub_date'].isoformat(),
+        'image': (default_storage.url(values['image'])
+                  if values['image'] else None),
+        'comment_count': values['comment_count'],
+        'author': values['author__username'],
+        'category': {
+            'slug': values['category__slug'],
+            'title': values['category__title'],
+        } if values['category__slug'] else None,
+        'location': (values['location__name']
+                     if values['location__is_published'] else None),
+    }
+
+
+def serialize_comment(comment):
+    return {
+        'id': comment.id,
+        'author': comment.author.username,
+        'text': comment.text,
+        'created_at': comment.created_at.isoformat(),
+    }
+
+
+class PostListApiView(View):
+    """Лента в JSON: только нужные колонки и курсорная пагинация."""
+
+    def get_queryset(self):
+        return Post.objects.filter(published_filter())
+
+    def get(self, request, *args, **kwargs):
+        paginator = CursorPaginator(
+            self.get_queryset().values(*POST_FIELDS),
+            settings.POST_COUNT_ON_PAGE
+        )
+        try:
+            page = paginator.page(
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+            )
+        except InvalidPage:
+            raise Http404('Страница не найдена')
+        return JsonResponse({
+            'results': [serialize_post(values) for values in page],
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+        })
+
+
+@method_decorator(feed_freshness.condition(), name='get')
+class PostsApiView(PostListApiView):
+    pass
+
+
+@method_decorator(category_freshness.condition(), name='get')
+class CategoryPostsApiView(PostListApiView):
+
+    def get_queryset(self):
+        category = get_category_or_404(
+            self.kwargs['category_slug'], self.request)
+        return super().get_queryset().filter(category=category)
+
+
+@method_decorator(profile_freshness.condition(), name='get')
+class ProfilePostsApiView(PostListApiView):
+
+    def get_queryset(self):
+        profile = get_profile_or_404(self.kwargs['username'], self.request)
+        if self.request.user == profile:
+            return profile.posts.all()
+        return super().get_queryset().filter(author=profile)
+
+
+@method_decorator(post_freshness.condition(), name='get')
+class PostApiView(View):
+
+    def get(self, request, post_id):
+        post = get_visible_post_or_404(post_id, request.user)
+        comments = get_comments_page(post)
+        data = serialize_post({
+            'id': post.id,
+            'title': post.title,
+            'text': post.text,
+            'pub_date': post.pub_date,
+            'image': post.image.name,
+            'comment_count': post.comment_count,
+            'author__username': post.author.username,
+            'category__slug': post.category and post.category.slug,
+            'category__title': post.category and post.category.title,
+            'location__name': post.location and post.location.name,
+            'location__is_published': (post.location
+                                       and post.location.is_published),
+        })
+        data['comments'] = [serialize_comment(comment) for comment in comments]
+        data['comments_next'] = comments.next_cursor
+        return JsonResponse(data)
@@ -0,0 +1,16 @@
+from django.urls import path
+
+from . import api
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', api.PostsApiView.as_view(), name='index'),
+    path('posts/<int:post_id>/', api.PostApiView.as_view(),
+         name='post_detail'),
+    path('category/<slug:category_slug>/',
+         api.CategoryPostsApiView.as_view(),
+         name='category_posts'),
+    path('profile/<str:username>/', api.ProfilePostsApiView.as_view(),
+         name='profile'),
+]
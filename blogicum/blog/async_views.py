@@ -0,0 +1,57 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.template.response import SimpleTemplateResponse
+
+
+def _load_user(request):
+    """Загружает ленивого пользователя сессии в синхронном потоке.
+
+    Иначе первое обращение к request.user после возврата в async-код
+    (middleware, шаблонные ответы) пошло бы в БД из event loop.
+    """
+    return request.user.is_authenticated
+
+
+def _prepare(view, request, args, kwargs):
+    """Вся синхронная работа view за один переход в поток.
+
+    Здесь же рендерится шаблон: он читает и пишет кэши фрагментов и лент,
+    и эти операции блокируют поток.
+    """
+    response = view(request, *args, **kwargs)
+    _load_user(request)
+    if isinstance(response, SimpleTemplateResponse) and (
+            not response.is_rendered):
+        started = time.perf_counter()
+        response.render()
+        if hasattr(request, 'metrics'):
+            request.metrics.template_seconds += (
+                time.perf_counter() - started)
+    return response
+
+
+def as_async_view(view_class, **initkwargs):
+    """Асинхронная версия CBV чтения для ASGI.
+
+    Запросы к БД (включая условный GET, кэш лент и пользователя сессии)
+    и рендеринг выполняются за один sync_to_async. Ответ остаётся
+    TemplateResponse, поэтому process_template_response middleware
+    вызывается как обычно.
+    """
+    view = view_class.as_view(**initkwargs)
+    prepare = sync_to_async(_prepare, thread_sensitive=True)
+
+    async def async_view(request, *args, **kwargs):
+        return await prepare(view, request, args, kwargs)
+
+    async_view.view_class = view_class
+    return async_view
+
+
+def read_view(view_class, **initkwargs):
+    """View для чтения: асинхронная при ASYNC_READ_VIEWS, иначе обычная."""
+    if settings.ASYNC_READ_VIEWS:
+        return as_async_view(view_class, **initkwargs)
+    return view_class.as_view(**initkwargs)
@@ -0,0 +1,69 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .models import Post
+
+GENERATION_KEY = 'blog:feed:generation'
+MISSING = object()
+
+
+def get_feed_cache():
+    return caches[settings.FEED_CACHE_ALIAS]
+
+
+def get_generation():
+    """Текущее поколение кэша лент."""
+    cache = get_feed_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    """Делает недействительными все закэшированные страницы лент."""
+    cache = get_feed_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), None)
+
+
+def make_feed_key(view_name, query='', **kwargs):
+    params = '&'.join(f'{name}={kwargs[name]}' for name in sorted(kwargs))
+    digest = hashlib.md5(f'{params}?{query}'.encode()).hexdigest()
+    return f'blog:feed:{get_generation()}:{view_name}:{digest}'
+
+
+def get_next_publication(**filters):
+    """Ближайшая будущая pub_date среди постов ленты или None."""
+    cache = get_feed_cache()
+    key = make_feed_key('next_publication', **filters)
+    now = timezone.now()
+    next_pub_date = cache.get(key, MISSING)
+    if next_pub_date is MISSING or (
+            next_pub_date is not None and next_pub_date <= now):
+        next_pub_date = Post.objects.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__gt=now,
+            **filters
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
+        cache.set(key, next_pub_date, settings.FEED_CACHE_TIMEOUT)
+    return next_pub_date
+
+
+def get_feed_timeout(**filters):
+    """Время жизни страницы ленты: не дольше, чем до следующей публикации."""
+    timeout = settings.FEED_CACHE_TIMEOUT
+    next_pub_date = get_next_publication(**filters)
+    if next_pub_date is not None:
+        delta = (next_pub_date - timezone.now()).total_seconds()
+        timeout = min(timeout, max(math.ceil(delta), 1))
+    return timeout
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_feed_cache(app_configs, **kwargs):
+    """Кэш лент в памяти процесса не сбрасывается в других воркерах."""
+    backend = settings.CACHES[settings.FEED_CACHE_ALIAS]['BACKEND']
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        f'Кэш лент {settings.FEED_CACHE_ALIAS!r} хранится в памяти '
+        f'процесса: при нескольких воркерах страницы лент устаревают '
+        f'до FEED_CACHE_TIMEOUT.',
+        hint='Укажите общий кэш в BLOGICUM_FEED_CACHE, например shared.',
+        id='blog.W001',
+    )]
@@ -0,0 +1,136 @@
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.http import HttpResponse
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+
+from .cache import get_feed_cache, get_feed_timeout, make_feed_key
+from .freshness import author_freshness, category_freshness, feed_freshness
+from .lookups import get_category_or_404, get_profile_or_404
+from .query_utils import get_posts_queryset
+
+
+class LatestPostsFeed(Feed):
+    title = 'Блогикум'
+    link = reverse_lazy('blog:index')
+    description = 'Новые публикации Блогикума.'
+
+    def items(self):
+        return get_posts_queryset(
+            show_hidden=False
+        )[:settings.SYNDICATION_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_categories(self, item):
+        return (item.category.title,) if item.category else ()
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+
+    def get_object(self, request, category_slug):
+        return get_category_or_404(category_slug, request)
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=[obj.slug])
+
+    def description(self, obj):
+        return obj.description
+
+    def items(self, obj):
+        return get_posts_queryset(
+            manager=obj.posts,
+            show_hidden=False
+        )[:settings.SYNDICATION_ITEMS]
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+
+    def get_object(self, request, username):
+        return get_profile_or_404(username, request)
+
+    def title(self, obj):
+        return f'Блогикум: публикации {obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=[obj.username])
+
+    def description(self, obj):
+        return f'Публикации пользователя {obj.username}.'
+
+    def items(self, obj):
+        return get_posts_queryset(
+            manager=obj.posts,
+            show_hidden=False
+        )[:settings.SYNDICATION_ITEMS]
+
+
+class AtomLatestPostsFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class AtomCategoryPostsFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AtomAuthorPostsFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+def cached_feed(feed, freshness):
+    """Отдаёт заранее сгенерированный XML ленты из кэша.
+
+    Документ строится один раз на поколение кэша лент и живёт не дольше,
+    чем до ближайшей отложенной публикации.
+    """
+    @freshness.condition()
+    def view(request, **kwargs):
+        key = make_feed_key(
+            request.resolver_match.view_name,
+            request.build_absolute_uri('/'),
+            **kwargs
+        )
+        cache = get_feed_cache()
+        cached = cache.get(key)
+        if cached is None:
+            response = feed(request, **kwargs)
+            cached = (response.content, response['Content-Type'])
+            cache.set(
+                key,
+                cached,
+                get_feed_timeout(**freshness.get_filters(kwargs))
+            )
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+    return view
+
+
+latest_rss = cached_feed(LatestPostsFeed(), feed_freshness)
+latest_atom = cached_feed(AtomLatestPostsFeed(), feed_freshness)
+category_rss = cached_feed(CategoryPostsFeed(), category_freshness)
+category_atom = cached_feed(AtomCategoryPostsFeed(), category_freshness)
+author_rss = cached_feed(AuthorPostsFeed(), author_freshness)
+author_atom = cached_feed(AtomAuthorPostsFeed(), author_freshness)
@@ -0,0 +1,120 @@
+import hashlib
+
+from django.db.models import DateTimeField, Q, Subquery
+from django.views.decorators.http import condition
+
+from .cache import get_generation
+from .lookups import memoize
+from .models import Post
+from .query_utils import published_filter
+
+
+class Freshness:
+    """ETag и Last-Modified ленты без построения основного queryset.
+
+    Водяной знак берётся из базы одним запросом по индексам, поэтому
+    одинаков во всех процессах. Наибольший id и самое позднее
+    updated_at меняются при создании и изменении: комментарии,
+    категории, местоположения и авторы обновляют updated_at своих
+    постов. pub_date самого свежего видимого поста меняется при
+    наступлении отложенной публикации. Удаление видно по поколению кэша
+    лент: его поднимает сигнал post_delete, и при общем
+    FEED_CACHE_ALIAS оно одно на все процессы.
+
+    anonymous_only — для HTML-страниц: у вошедшего пользователя в них
+    CSRF-токен и данные сессии, которые 304 оставил бы от прошлого
+    входа, поэтому им условный GET не отвечает.
+    """
+
+    def __init__(self, lookups=None, per_user=False, anonymous_only=False):
+        self.lookups = lookups or {}
+        self.per_user = per_user
+        self.anonymous_only = anonymous_only
+
+    def get_filters(self, kwargs):
+        return {
+            lookup: kwargs[kwarg] for lookup, kwarg in self.lookups.items()
+        }
+
+    def get_visible_filter(self, request):
+        visible = published_filter()
+        if self.per_user and request.user.is_authenticated:
+            visible |= Q(author=request.user)
+        return visible
+
+    def get_watermark(self, request, kwargs):
+        """(max id, поколение, max updated_at, pub_date видимого)."""
+        filters = self.get_filters(kwargs)
+        max_id, updated_at, pub_date = memoize(
+            request,
+            ('freshness', self.per_user, tuple(sorted(filters.items()))),
+            lambda: load_watermark(
+                self.get_visible_filter(request), filters),
+        )
+        return max_id, get_generation(), updated_at, pub_date
+
+    def applies(self, request):
+        return not (
+            self.anonymous_only and request.user.is_authenticated)
+
+    def etag(self, request, *args, **kwargs):
+        if not self.applies(request):
+            return None
+        parts = [
+            *self.get_watermark(request, kwargs),
+            request.get_full_path(),
+        ]
+        if self.per_user:
+            parts.append(request.user.pk)
+        return hashlib.md5('|'.join(map(str, parts)).encode()).hexdigest()
+
+    def last_modified(self, request, *args, **kwargs):
+        if not self.applies(request):
+            return None
+        _, _, updated_at, pub_date = self.get_watermark(request, kwargs)
+        return max(filter(None, (updated_at, pub_date)), default=None)
+
+    def condition(self):
+        """Декоратор условного GET для view."""
+        return condition(
+            etag_func=self.etag,
+            last_modified_func=self.last_modified
+        )
+
+
+def load_watermark(visible, filters):
+    """Водяной знак данных: каждая часть берётся по индексу."""
+    posts = Post.objects.order_by()
+    annotations = {
+        'max_id': Subquery(
+            posts.order_by('-pk').values('pk')[:1]),
+        'last_update': Subquery(
+            posts.order_by('-updated_at').values('updated_at')[:1],
+            output_field=DateTimeField()),
+    }
+    latest = Post.objects.filter(visible, **filters).order_by(
+        '-pub_date').annotate(**annotations).values_list(
+        'max_id', 'last_update', 'pub_date').first()
+    if latest is None:
+        # Видимых постов нет: остаются общие части.
+        common = Post.objects.annotate(**annotations).values_list(
+            'max_id', 'last_update').first()
+        latest = (*(common or (None, None)), None)
+    return latest
+
+
+feed_freshness = Freshness()
+category_freshness = Freshness({'category__slug': 'category_slug'})
+author_freshness = Freshness({'author__username': 'username'})
+profile_freshness = Freshness({'author__username': 'username'}, per_user=True)
+post_freshness = Freshness({'pk': 'post_id'}, per_user=True)
+feed_page_freshness = Freshness(anonymous_only=True)
+category_page_freshness = Freshness(
+    {'category__slug': 'category_slug'},
+    anonymous_only=True
+)
+profile_page_freshness = Freshness(
+    {'author__username': 'username'},
+    anonymous_only=True
+)
+post_page_freshness = Freshness({'pk': 'post_id'}, anonymous_only=True)
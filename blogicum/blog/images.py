@@ -0,0 +1,101 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import bump_generation
+
+DERIVATIVES_DIR = 'posts_images/derived'
+
+
+def _encode(image, image_format):
+    buffer = BytesIO()
+    options = {'quality': settings.POST_IMAGE_QUALITY}
+    if image_format == 'PNG':
+        options = {'optimize': True}
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def _store(name, content):
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(content))
+    return name
+
+
+def build_variants(image_file):
+    """Строит уменьшенные копии изображения в исходном формате и WebP.
+
+    Имена файлов содержат хэш исходника, поэтому повторная сборка
+    не создаёт дубликатов, а изменённое изображение получает новые URL.
+    """
+    image_file.open('rb')
+    try:
+        source = image_file.read()
+    finally:
+        image_file.close()
+    digest = hashlib.sha1(source).hexdigest()[:16]
+    original = ImageOps.exif_transpose(Image.open(BytesIO(source)))
+    has_alpha = original.mode in ('RGBA', 'LA', 'P')
+    fallback_format, extension = (
+        ('PNG', 'png') if has_alpha else ('JPEG', 'jpg')
+    )
+    original = original.convert('RGBA' if has_alpha else 'RGB')
+    widths = sorted(
+        width for width in settings.POST_IMAGE_WIDTHS
+        if width < original.width
+    ) + [original.width]
+    images = []
+    for width in widths:
+        height = round(original.height * width / original.width)
+        resized = original.resize((width, height), Image.LANCZOS)
+        base = f'{DERIVATIVES_DIR}/{digest}_{width}w'
+        images.append({
+            'width': width,
+            'height': height,
+            'fallback': _store(
+                f'{base}.{extension}', _encode(resized, fallback_format)
+            ),
+            'webp': _store(f'{base}.webp', _encode(resized, 'WEBP')),
+        })
+    return {
+        'source': image_file.name,
+        'width': original.width,
+        'height': original.height,
+        'images': images,
+    }
+
+
+def variants_outdated(post):
+    if not post.image:
+        return bool(post.image_variants)
+    return post.image_variants.get('source') != post.image.name
+
+
+def _store_variants(post, variants):
+    # update() не вызывает сигналов: страницы лент с пометкой об
+    # обработке сбрасываются здесь.
+    post.image_variants = variants
+    type(post).objects.filter(pk=post.pk).update(
+        image_variants=post.image_variants,
+        updated_at=timezone.now()
+    )
+    bump_generation()
+
+
+def refresh_variants(post):
+    """Пересобирает копии изображения поста без вызова save()."""
+    _store_variants(post, build_variants(post.image) if post.image else {})
+
+
+def mark_variants_failed(post):
+    """Копии собрать не удалось: шаблон покажет исходное изображение.
+
+    source совпадает с текущим файлом, поэтому задание не ставится
+    повторно, пока изображение не заменят.
+    """
+    _store_variants(post, {'source': post.image.name, 'failed': True})
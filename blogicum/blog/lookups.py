@@ -0,0 +1,113 @@
+"""Кэширование частых поисков категорий и профилей для view.
+
+Два уровня: memoize() — на время одного запроса, LookupCache — LRU
+в памяти процесса с TTL. Сохранение объекта очищает LRU своего
+процесса и меняет версию в кэше лент (FEED_CACHE_ALIAS). Другие
+процессы видят новую версию, только если этот кэш общий; с locmem
+их записи устаревают не дольше, чем на LOOKUP_CACHE_TIMEOUT.
+Закэшированные объекты общие для запросов: их нельзя изменять.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import Http404
+
+from .cache import get_feed_cache
+from .models import Category
+
+User = get_user_model()
+
+
+def memoize(request, key, load):
+    """Результат load() один раз за запрос."""
+    if request is None:
+        return load()
+    memo = request.__dict__.setdefault('_blog_lookups', {})
+    if key not in memo:
+        memo[key] = load()
+    return memo[key]
+
+
+class LookupCache:
+    """LRU объектов по ключу с временем жизни и общей версией."""
+
+    def __init__(self, name, load):
+        self.load = load
+        self.version_key = f'blog:lookups:{name}:version'
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_version(self):
+        return get_feed_cache().get(self.version_key, 0)
+
+    def get(self, key):
+        """Объект по ключу или None, если его нет в базе."""
+        version = self.get_version()
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] > now and entry[2] == version:
+                self.entries.move_to_end(key)
+                return entry[0]
+        value = self.load(key)
+        if value is None:
+            return None
+        with self.lock:
+            self.entries[key] = (
+                value, now + settings.LOOKUP_CACHE_TIMEOUT, version)
+            self.entries.move_to_end(key)
+            while len(self.entries) > settings.LOOKUP_CACHE_SIZE:
+                self.entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+        cache = get_feed_cache()
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, time.time_ns(), None)
+
+
+category_cache = LookupCache(
+    'category',
+    lambda slug: Category.objects.filter(
+        slug=slug, is_published=True).first(),
+)
+# Только поля публичного профиля: без пароля, почты и прав.
+PROFILE_FIELDS = (
+    'id',
+    'username',
+    'first_name',
+    'last_name',
+    'date_joined',
+    'is_staff',
+)
+
+profile_cache = LookupCache(
+    'profile',
+    lambda username: User.objects.only(*PROFILE_FIELDS).filter(
+        username=username).first(),
+)
+
+
+def get_category_or_404(slug, request=None):
+    """Опубликованная категория по slug."""
+    category = memoize(
+        request, ('category', slug), lambda: category_cache.get(slug))
+    if category is None:
+        raise Http404('Категория не найдена')
+    return category
+
+
+def get_profile_or_404(username, request=None):
+    """Пользователь по username."""
+    profile = memoize(
+        request, ('profile', username), lambda: profile_cache.get(username))
+    if profile is None:
+        raise Http404('Пользователь не найден')
+    return profile
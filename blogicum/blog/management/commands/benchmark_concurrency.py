@@ -0,0 +1,149 @@
+import asyncio
+import json
+import random
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client
+
+from .benchmark_views import Command as BenchmarkViewsCommand
+from .benchmark_views import (
+    REMOTE_ADDR,
+    git_revision,
+    percentile,
+    positive_int,
+)
+
+
+class HostAsyncClient(AsyncClient):
+    """AsyncClient с заданным заголовком Host вместо testserver и адресом
+    клиента не из INTERNAL_IPS."""
+
+    def __init__(self, host, **defaults):
+        super().__init__(**defaults)
+        self.host = host.encode()
+
+    def _base_scope(self, **request):
+        scope = super()._base_scope(**request)
+        scope['client'] = [REMOTE_ADDR, 0]
+        scope['headers'] = [
+            (name, self.host if name == b'host' else value)
+            for name, value in scope['headers']
+        ]
+        return scope
+
+
+class Command(BaseCommand):
+    help = ('Замеряет пропускную способность страниц чтения при '
+            'конкурентных запросах через ASGI или WSGI.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interface', choices=('asgi', 'wsgi'), default='asgi',
+            help='Обработчик для запросов внутри процесса.',
+        )
+        parser.add_argument(
+            '--target',
+            help='Адрес запущенного сервера (uvicorn, gunicorn); '
+                 'при указании запросы идут по HTTP.',
+        )
+        parser.add_argument('--requests', type=positive_int, default=500)
+        parser.add_argument(
+            '--concurrency', type=positive_int, default=20)
+        parser.add_argument('--host', default='localhost')
+        parser.add_argument('--output', help='Файл для JSON-отчёта.')
+        parser.add_argument('--label', default='')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def make_urls(self, total):
+        scenarios = list(BenchmarkViewsCommand().get_scenarios().values())
+        return [random.choice(scenarios)() for _ in range(total)]
+
+    async def run_asgi(self, urls, concurrency, host):
+        client = HostAsyncClient(host)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(url):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url)
+                return (time.perf_counter() - started,
+                        response.status_code)
+
+        return await asyncio.gather(*(fetch(url) for url in urls))
+
+    def run_wsgi(self, urls, concurrency, host):
+        client = Client(HTTP_HOST=host, REMOTE_ADDR=REMOTE_ADDR)
+
+        def fetch(url):
+            started = time.perf_counter()
+            response = client.get(url)
+            return time.perf_counter() - started, response.status_code
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            return list(executor.map(fetch, urls))
+
+    def run_http(self, urls, concurrency, target):
+        target = target.rstrip('/')
+
+        def fetch(url):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(target + url) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as error:
+                status = error.code
+            return time.perf_counter() - started, status
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            return list(executor.map(fetch, urls))
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        urls = self.make_urls(options['requests'])
+        concurrency = options['concurrency']
+        started = time.perf_counter()
+        if options['target']:
+            interface = 'http'
+            results = self.run_http(urls, concurrency, options['target'])
+        elif options['interface'] == 'asgi':
+            interface = 'asgi'
+            results = asyncio.run(
+                self.run_asgi(urls, concurrency, options['host']))
+        else:
+            interface = 'wsgi'
+            results = self.run_wsgi(urls, concurrency, options['host'])
+        elapsed = time.perf_counter() - started
+        latencies = [seconds * 1000 for seconds, _ in results]
+        report = {
+            'label': options['label'],
+            'revision': git_revision(),
+            'timestamp': int(time.time()),
+            'interface': interface,
+            'async_read_views': settings.ASYNC_READ_VIEWS,
+            'concurrency': concurrency,
+            'requests': len(results),
+            'errors': sum(status >= 400 for _, status in results),
+            'throughput_rps': round(len(results) / elapsed, 2),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+        }
+        self.stdout.write(
+            f'{interface}: {report["throughput_rps"]} запросов/с, '
+            f'p50 {report["p50_ms"]} мс, p95 {report["p95_ms"]} мс, '
+            f'p99 {report["p99_ms"]} мс'
+        )
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
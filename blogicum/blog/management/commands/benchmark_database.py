@@ -0,0 +1,114 @@
+import json
+import multiprocessing
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+
+from blog.models import Comment
+from blog.query_utils import get_posts_queryset
+
+from .benchmark_views import git_revision, percentile
+
+User = get_user_model()
+
+
+def p95(values):
+    return round(percentile(values, 95), 3) if values else None
+
+
+def run_worker(arguments):
+    """Чтения и записи в отдельном процессе до истечения duration."""
+    post_ids, user_ids, duration, write_ratio, tag, seed = arguments
+    random.seed(seed)
+    reads, writes, locked = [], [], 0
+    visible = get_posts_queryset(show_hidden=False)
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if random.random() < write_ratio:
+                Comment.objects.create(
+                    text=tag,
+                    post_id=random.choice(post_ids),
+                    author_id=random.choice(user_ids),
+                )
+                writes.append(time.perf_counter() - started)
+            else:
+                offset = random.randint(0, 50) * settings.POST_COUNT_ON_PAGE
+                list(visible[offset:offset + settings.POST_COUNT_ON_PAGE])
+                visible.filter(pk=random.choice(post_ids)).first()
+                reads.append(time.perf_counter() - started)
+        except OperationalError:
+            locked += 1
+    connections.close_all()
+    return reads, writes, locked
+
+
+class Command(BaseCommand):
+    help = ('Замеряет пропускную способность чтений и записей базы '
+            'при параллельных процессах-воркерах.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument(
+            '--write-ratio', type=float, default=0.1,
+            help='Доля операций записи (создание комментария).',
+        )
+        parser.add_argument('--output', help='Файл для JSON-отчёта.')
+        parser.add_argument('--label', default='')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        tag = f'benchmark-{uuid.uuid4().hex}'
+        post_ids = list(get_posts_queryset(show_hidden=False).values_list(
+            'pk', flat=True)[:1000])
+        user_ids = list(User.objects.values_list('pk', flat=True)[:1000])
+        duration = options['duration']
+        tasks = [
+            (post_ids, user_ids, duration, options['write_ratio'], tag,
+             random.random())
+            for _ in range(options['workers'])
+        ]
+        # Соединение родителя не должно наследоваться дочерними процессами.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        with context.Pool(options['workers']) as pool:
+            results = pool.map(run_worker, tasks)
+        reads = [value * 1000 for result in results for value in result[0]]
+        writes = [value * 1000 for result in results for value in result[1]]
+        locked = sum(result[2] for result in results)
+        database = connection.settings_dict
+        report = {
+            'label': options['label'],
+            'revision': git_revision(),
+            'timestamp': int(time.time()),
+            'database': connection.vendor,
+            'conn_max_age': database['CONN_MAX_AGE'],
+            'pragmas': database.get('PRAGMAS', {}),
+            'workers': options['workers'],
+            'duration_s': duration,
+            'reads_per_s': round(len(reads) / duration, 1),
+            'writes_per_s': round(len(writes) / duration, 1),
+            'locked_errors': locked,
+            'read_p95_ms': p95(reads),
+            'write_p95_ms': p95(writes),
+        }
+        deleted, _ = Comment.objects.filter(text=tag).delete()
+        self.stdout.write(
+            f'чтений {report["reads_per_s"]}/с, записей '
+            f'{report["writes_per_s"]}/с, блокировок {locked}; '
+            f'удалено тестовых комментариев {deleted}'
+        )
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,97 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+
+from blog.query_utils import get_posts_queryset
+
+from .benchmark_views import git_revision, percentile, positive_int
+
+PAGE_TEMPLATE = (
+    '{% for post in posts %}'
+    '{% include "includes/post_card.html" %}'
+    '{% endfor %}'
+)
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def make_engine(cached):
+    """Движок шаблонов из настроек проекта с кэширующим загрузчиком или без."""
+    config = settings.TEMPLATES[0]
+    options = {**config['OPTIONS'], 'debug': False}
+    options['loaders'] = (
+        [('django.template.loaders.cached.Loader', LOADERS)]
+        if cached else LOADERS
+    )
+    return DjangoTemplates({
+        'NAME': f'benchmark-{cached}',
+        'DIRS': config['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': options,
+    })
+
+
+class Command(BaseCommand):
+    help = ('Замеряет рендеринг страницы из карточек постов с кэширующим '
+            'загрузчиком шаблонов и кэшем фрагментов и без них.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=10)
+        parser.add_argument('--renders', type=positive_int, default=300)
+        parser.add_argument('--output', help='Файл для JSON-отчёта.')
+        parser.add_argument('--label', default='')
+
+    def measure(self, engine, posts, renders, fragments):
+        cache = caches['template_fragments']
+        latencies = []
+        for _ in range(renders):
+            if not fragments:
+                cache.clear()
+            # Загрузка шаблона входит в замер: её и экономит кэширующий
+            # загрузчик.
+            started = time.perf_counter()
+            engine.from_string(PAGE_TEMPLATE).render({'posts': posts})
+            latencies.append((time.perf_counter() - started) * 1000)
+        return {
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+        }
+
+    def handle(self, *args, **options):
+        posts = list(get_posts_queryset(show_hidden=False)[
+            :options['cards']])
+        results = {}
+        for cached in (False, True):
+            engine = make_engine(cached)
+            for fragments in (False, True):
+                name = (f'loader_{"cached" if cached else "plain"}_'
+                        f'fragments_{"on" if fragments else "off"}')
+                self.measure(engine, posts, 5, fragments)
+                results[name] = self.measure(
+                    engine, posts, options['renders'], fragments)
+                self.stdout.write(
+                    f'{name}: p50 {results[name]["p50_ms"]} мс, '
+                    f'p95 {results[name]["p95_ms"]} мс'
+                )
+        report = {
+            'label': options['label'],
+            'revision': git_revision(),
+            'timestamp': int(time.time()),
+            'cards': len(posts),
+            'renders': options['renders'],
+            'scenarios': results,
+        }
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
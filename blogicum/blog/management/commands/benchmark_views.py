@@ -0,0 +1,161 @@
+import argparse
+import json
+import random
+import resource
+import statistics
+import subprocess
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from blog.middleware import RequestStats, track_queries
+from blog.models import Category, Post
+from blog.query_utils import get_posts_queryset
+
+User = get_user_model()
+
+# Адрес не из INTERNAL_IPS: иначе при DEBUG в каждый замер попадает
+# django-debug-toolbar.
+REMOTE_ADDR = '203.0.113.10'
+
+NO_CACHE_SETTINGS = {
+    'CACHES': {
+        **settings.CACHES,
+        'benchmark': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        },
+    },
+    'FEED_CACHE_ALIAS': 'benchmark',
+}
+
+
+def percentile(values, percent):
+    """Перцентиль замеров; quantiles() требует хотя бы двух значений."""
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[
+        percent - 1]
+
+
+def positive_int(value):
+    """Тип аргумента для числа замеров: без замеров отчёт пуст."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError('нужно число не меньше 1')
+    return number
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ('Замеряет задержку и число SQL-запросов основных страниц '
+            'и пишет отчёт в JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=positive_int, default=200)
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--host', default='localhost')
+        parser.add_argument('--output', help='Файл для JSON-отчёта.')
+        parser.add_argument('--label', default='')
+        parser.add_argument(
+            '--cache', action='store_true',
+            help='Не отключать кэш страниц лент.',
+        )
+        parser.add_argument('--seed', type=int, default=None)
+
+    def get_scenarios(self):
+        visible = get_posts_queryset(show_hidden=False)
+        pages = max(visible.count() // settings.POST_COUNT_ON_PAGE, 1)
+        post_ids = list(visible.values_list('pk', flat=True)[:1000])
+        slugs = list(Category.objects.filter(
+            is_published=True).values_list('slug', flat=True)[:1000])
+        usernames = list(User.objects.filter(
+            posts__isnull=False).values_list(
+            'username', flat=True).distinct()[:1000])
+        return {
+            'blog:index': lambda: (
+                reverse('blog:index')
+                + f'?page={random.randint(1, min(pages, 50))}'),
+            'blog:category_posts': lambda: reverse(
+                'blog:category_posts', args=[random.choice(slugs)]),
+            'blog:profile': lambda: reverse(
+                'blog:profile', args=[random.choice(usernames)]),
+            'blog:post_detail': lambda: reverse(
+                'blog:post_detail', args=[random.choice(post_ids)]),
+        }
+
+    def measure(self, client, make_url, total, warmup):
+        latencies, queries, errors = [], [], 0
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        for number in range(warmup + total):
+            url = make_url()
+            stats = RequestStats()
+            with track_queries(stats):
+                started = time.perf_counter()
+                response = client.get(url)
+                elapsed = time.perf_counter() - started
+            if number < warmup:
+                continue
+            errors += response.status_code >= 400
+            latencies.append(elapsed * 1000)
+            queries.append(stats.queries)
+        return {
+            'requests': total,
+            'errors': errors,
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'queries_mean': round(statistics.fmean(queries), 2),
+            'queries_max': max(queries),
+            'max_rss_growth_kb': resource.getrusage(
+                resource.RUSAGE_SELF).ru_maxrss - rss_before,
+        }
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        client = Client(HTTP_HOST=options['host'], REMOTE_ADDR=REMOTE_ADDR)
+        results = {}
+        with ExitStack() as stack:
+            if not options['cache']:
+                stack.enter_context(override_settings(**NO_CACHE_SETTINGS))
+            for name, make_url in self.get_scenarios().items():
+                results[name] = self.measure(
+                    client, make_url, options['requests'], options['warmup'])
+                self.stdout.write(
+                    f'{name}: p50 {results[name]["p50_ms"]} мс, '
+                    f'p95 {results[name]["p95_ms"]} мс, '
+                    f'p99 {results[name]["p99_ms"]} мс, '
+                    f'запросов {results[name]["queries_mean"]}'
+                )
+        report = {
+            'label': options['label'],
+            'revision': git_revision(),
+            'timestamp': int(time.time()),
+            'database': connection.vendor,
+            'posts': Post.objects.count(),
+            'cache': options['cache'],
+            'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            'scenarios': results,
+        }
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
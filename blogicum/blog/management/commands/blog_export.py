@@ -0,0 +1,34 @@
+import resource
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.transfer import TRANSFER_MODELS, export_records, open_stream
+
+
+class Command(BaseCommand):
+    help = ('Выгружает пользователей, категории, местоположения, посты и '
+            'комментарии в NDJSON потоком.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', help='Файл NDJSON (.gz — со сжатием, «-» — stdout).')
+        parser.add_argument('--chunk-size', type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        total, started = 0, time.perf_counter()
+        with open_stream(options['output'], 'wb') as stream:
+            for model in TRANSFER_MODELS:
+                count = 0
+                for line in export_records(model, options['chunk_size']):
+                    stream.write(line)
+                    count += 1
+                total += count
+                self.stderr.write(
+                    f'{model._meta.verbose_name_plural}: {count}')
+        elapsed = time.perf_counter() - started
+        self.stderr.write(self.style.SUCCESS(
+            f'Выгружено {total} записей за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-9):.0f} строк/с), пик памяти '
+            f'{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss} КБ.'
+        ))
@@ -0,0 +1,56 @@
+import resource
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.transfer import Importer, TransferError
+
+
+class Command(BaseCommand):
+    help = ('Загружает NDJSON из blog_export пакетами bulk_create; '
+            'прерванный импорт продолжается с --resume.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', help='Файл NDJSON (.gz — со сжатием, «-» — stdin).')
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument(
+            '--state', help='Файл состояния (по умолчанию <input>.state).')
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Продолжить с места, сохранённого в файле состояния.',
+        )
+
+    def progress(self, label, rows):
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            f'{label}: {rows} ({rows / max(elapsed, 1e-9):.0f} строк/с '
+            f'с начала импорта)'
+        )
+
+    def handle(self, *args, **options):
+        self.started = time.perf_counter()
+        try:
+            importer = Importer(
+                options['input'],
+                batch_size=options['batch_size'],
+                state_path=options['state'],
+                resume=options['resume'],
+            )
+            stats = importer.run(self.progress)
+        except (TransferError, FileNotFoundError) as error:
+            raise CommandError(error)
+        total = 0
+        for label, (rows, seconds) in stats.items():
+            total += rows
+            if rows:
+                self.stdout.write(
+                    f'{label}: {rows} за {seconds:.1f} с '
+                    f'({rows / max(seconds, 1e-9):.0f} строк/с)'
+                )
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {total} записей за {elapsed:.1f} с, пик памяти '
+            f'{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss} КБ. '
+            'Для поиска выполните rebuild_search_index.'
+        ))
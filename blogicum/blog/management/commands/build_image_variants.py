@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import refresh_variants, variants_outdated
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Строит уменьшенные копии изображений существующих постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересобрать копии даже для актуальных постов.',
+        )
+
+    def handle(self, *args, **options):
+        built = failed = 0
+        posts = Post.objects.exclude(image='').only('image', 'image_variants')
+        for post in posts.iterator():
+            if not options['force'] and not variants_outdated(post):
+                continue
+            try:
+                refresh_variants(post)
+            except (OSError, ValueError) as error:
+                failed += 1
+                self.stderr.write(f'Пост {post.pk}: {error}')
+                continue
+            built += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано постов: {built}, ошибок: {failed}.'
+        ))
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from blog.models import Category, Comment, Post
+from blog.query_utils import get_posts_queryset
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Выводит EXPLAIN для основных запросов ленты.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='EXPLAIN ANALYZE (только PostgreSQL).',
+        )
+
+    def get_queries(self):
+        page = settings.POST_COUNT_ON_PAGE
+        queries = {
+            'Лента': get_posts_queryset(show_hidden=False)[:page],
+        }
+        category = Category.objects.filter(is_published=True).first()
+        if category:
+            queries['Лента категории'] = get_posts_queryset(
+                manager=category.posts,
+                show_hidden=False
+            )[:page]
+        author = User.objects.filter(posts__isnull=False).first()
+        if author:
+            queries['Лента автора'] = get_posts_queryset(
+                manager=author.posts
+            )[:page]
+        post = Post.objects.filter(comment_count__gt=0).first()
+        if post:
+            queries['Комментарии'] = Comment.objects.filter(
+                post=post
+            ).select_related('author')
+        return queries
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options['analyze'] and connection.vendor == 'postgresql':
+            explain_options['analyze'] = True
+        for title, queryset in self.get_queries().items():
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write('')
@@ -0,0 +1,95 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from blog.models import Category
+from blog.moderation import (
+    COMMENT_ACTIONS,
+    POST_ACTIONS,
+    ModerationError,
+    filter_comments,
+    filter_posts,
+    moderate,
+)
+
+
+def moment(value):
+    """Дата или дата и время из ISO-строки как aware datetime."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class Command(BaseCommand):
+    help = ('Публикует, снимает с публикации, переносит или удаляет посты '
+            'и комментарии по фильтру пакетами.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', choices=('posts', 'comments'))
+        parser.add_argument(
+            'action', choices=sorted(set(POST_ACTIONS + COMMENT_ACTIONS)))
+        parser.add_argument('--author', help='username автора.')
+        parser.add_argument('--category', help='slug категории.')
+        parser.add_argument(
+            '--from', dest='date_from', type=moment,
+            help='Начало диапазона дат включительно (ISO).',
+        )
+        parser.add_argument(
+            '--to', dest='date_to', type=moment,
+            help='Конец диапазона дат не включительно (ISO).',
+        )
+        parser.add_argument(
+            '--to-category', help='slug категории для recategorize.')
+        parser.add_argument('--chunk-size', type=int)
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только посчитать подходящие строки.',
+        )
+
+    def progress(self, rows, seconds):
+        self.stdout.write(
+            f'{rows} строк, {rows / max(seconds, 1e-9):.0f} строк/с')
+
+    def handle(self, *args, **options):
+        select = (
+            filter_posts if options['target'] == 'posts'
+            else filter_comments
+        )
+        queryset = select(
+            author=options['author'],
+            category=options['category'],
+            date_from=options['date_from'],
+            date_to=options['date_to'],
+        )
+        if options['dry_run']:
+            self.stdout.write(f'Подходит строк: {queryset.count()}')
+            return
+        category = None
+        if options['to_category']:
+            category = Category.objects.filter(
+                slug=options['to_category']).first()
+            if category is None:
+                raise CommandError(
+                    f'Категория {options["to_category"]} не найдена')
+        try:
+            rows, seconds = moderate(
+                queryset,
+                options['action'],
+                category=category,
+                chunk_size=options['chunk_size'],
+                progress=self.progress,
+            )
+        except ModerationError as error:
+            raise CommandError(error)
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: {rows} строк за {seconds:.1f} с '
+            f'({rows / max(seconds, 1e-9):.0f} строк/с).'
+        ))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from blog.models import Post
+from blog.query_utils import count_comments_subquery, refresh_comment_counts
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает или проверяет Post.comment_count.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить счётчики, ничего не меняя.',
+        )
+
+    def handle(self, *args, **options):
+        mismatched = Post.objects.annotate(
+            actual=count_comments_subquery()
+        ).exclude(comment_count=F('actual'))
+        if options['check']:
+            count = mismatched.count()
+            if count:
+                raise CommandError(
+                    f'Расхождение счётчика комментариев у {count} постов.'
+                )
+            self.stdout.write(self.style.SUCCESS('Счётчики корректны.'))
+            return
+        updated = refresh_comment_counts(
+            Post.objects.filter(pk__in=mismatched.values('pk'))
+        )
+        self.stdout.write(self.style.SUCCESS(f'Исправлено постов: {updated}.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс публикаций.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        indexed = 0
+        for post in Post.objects.only('title', 'text').iterator():
+            backend.index(post)
+            indexed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'{type(backend).__name__}: проиндексировано постов {indexed}.'
+        ))
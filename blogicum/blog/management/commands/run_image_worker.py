@@ -0,0 +1,67 @@
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.models import ImageJob
+from blog.tasks import claim_jobs, fail_job, init_worker, process_image_job
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь изображений в пуле процессов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=2,
+            help='Число процессов пула.',
+        )
+        parser.add_argument(
+            '--poll', type=float, default=2.0,
+            help='Пауза между опросами пустой очереди, секунд.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Обработать текущую очередь и завершиться.',
+        )
+        parser.add_argument(
+            '--requeue-running', action='store_true',
+            help='Вернуть в очередь задания, зависшие в статусе running.',
+        )
+
+    def handle(self, *args, **options):
+        if options['requeue_running']:
+            ImageJob.objects.filter(status=ImageJob.RUNNING).update(
+                status=ImageJob.PENDING
+            )
+        workers = options['workers']
+        connections.close_all()
+        with ProcessPoolExecutor(workers, initializer=init_worker) as pool:
+            while True:
+                job_ids = claim_jobs(workers * 4)
+                if not job_ids:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+                    continue
+                futures = [
+                    pool.submit(process_image_job, job_id)
+                    for job_id in job_ids
+                ]
+                for job_id, future in zip(job_ids, futures):
+                    self.report(job_id, future)
+
+    def report(self, job_id, future):
+        # Ошибка одного задания не останавливает воркер.
+        try:
+            status = future.result()
+        except BrokenProcessPool:
+            raise
+        except Exception:
+            status = fail_job(job_id, traceback.format_exc())
+        if status is None:
+            self.stdout.write(f'Задание {job_id}: удалено')
+        else:
+            self.stdout.write(f'Задание {job_id}: {status}')
@@ -0,0 +1,101 @@
+import random
+import time
+import uuid
+from array import array
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.cache import bump_generation
+from blog.models import Category, Comment, Location, Post
+from blog.query_utils import refresh_comment_counts
+
+User = get_user_model()
+
+WORDS = (
+    'день', 'дом', 'город', 'море', 'путь', 'книга', 'утро', 'вечер', 'лес',
+    'река', 'друг', 'письмо', 'дорога', 'солнце', 'ветер', 'поезд', 'чай',
+    'работа', 'музыка', 'история', 'погода', 'сад', 'окно', 'кот', 'гора',
+)
+
+
+def sentence(words):
+    return ' '.join(random.choices(WORDS, k=words)).capitalize() + '.'
+
+
+def ids_of(model):
+    return array('q', model.objects.values_list('pk', flat=True).iterator())
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими данными для нагрузочных тестов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=50_000)
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def bulk(self, model, total, factory, batch_size):
+        started = time.perf_counter()
+        for offset in range(0, total, batch_size):
+            model.objects.bulk_create(
+                [factory(index)
+                 for index in range(offset, min(offset + batch_size, total))],
+                batch_size=batch_size,
+            )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural}: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-9):.0f} строк/с)'
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        batch_size = options['batch_size']
+        run = uuid.uuid4().hex[:8]
+        now = timezone.now()
+        password = make_password(None)
+
+        self.bulk(User, options['users'], lambda i: User(
+            username=f'bench_{run}_{i}', password=password,
+        ), batch_size)
+        self.bulk(Category, options['categories'], lambda i: Category(
+            title=sentence(2), description=sentence(12),
+            slug=f'bench-{run}-{i}', is_published=random.random() > 0.05,
+        ), batch_size)
+        self.bulk(Location, options['locations'], lambda i: Location(
+            name=sentence(2),
+        ), batch_size)
+
+        user_ids = ids_of(User)
+        category_ids = ids_of(Category)
+        location_ids = ids_of(Location)
+        self.bulk(Post, options['posts'], lambda i: Post(
+            title=sentence(4),
+            text=' '.join(sentence(10) for _ in range(5)),
+            pub_date=now - timedelta(minutes=random.randint(-1_000, 2**20)),
+            author_id=random.choice(user_ids),
+            category_id=random.choice(category_ids),
+            location_id=random.choice(location_ids),
+            is_published=random.random() > 0.02,
+        ), batch_size)
+
+        post_ids = ids_of(Post)
+        self.bulk(Comment, options['comments'], lambda i: Comment(
+            text=sentence(8),
+            post_id=random.choice(post_ids),
+            author_id=random.choice(user_ids),
+        ), batch_size)
+
+        refresh_comment_counts()
+        bump_generation()
+        self.stdout.write(self.style.SUCCESS(
+            'Готово. Для поиска выполните rebuild_search_index.'
+        ))
@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import mimetypes
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import connections
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .metrics import registry
+from .routers import begin_request, end_request, get_state
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+
+
+# Учёт запросов привязан к контексту, а не к потоку: sync_to_async
+# переносит контекст в поток с соединениями, а параллельные запросы
+# ASGI не смешивают счётчики.
+_active_stats = ContextVar('blog_request_stats', default=())
+
+
+def record_query(execute, sql, params, many, context):
+    active = _active_stats.get()
+    if not active:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        for stats in active:
+            stats.queries += 1
+            stats.sql_seconds += elapsed
+
+
+def install_query_tracking(connection):
+    """Подключает record_query к соединению (один раз)."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def track_queries(stats):
+    """Считает в stats запросы текущего контекста во всех потоках."""
+    for connection in connections.all():
+        install_query_tracking(connection)
+    token = _active_stats.set((*_active_stats.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+class MetricsMiddleware:
+    """Собирает число и время SQL-запросов, рендеринга и ответа по view."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        stats = request.metrics = RequestStats()
+        started = time.perf_counter()
+        with track_queries(stats):
+            response = self.get_response(request)
+        self.observe(request, stats, started)
+        return response
+
+    async def __acall__(self, request):
+        stats = request.metrics = RequestStats()
+        started = time.perf_counter()
+        with track_queries(stats):
+            response = await self.get_response(request)
+        self.observe(request, stats, started)
+        return response
+
+    def observe(self, request, stats, started):
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        registry.observe(view_name, {
+            'blogicum_request_seconds': time.perf_counter() - started,
+            'blogicum_sql_queries': stats.queries,
+            'blogicum_sql_seconds': stats.sql_seconds,
+            'blogicum_template_seconds': stats.template_seconds,
+        })
+        self.check_budget(view_name, stats.queries)
+
+    def process_template_response(self, request, response):
+        # Асинхронные view рендерят сами и учитывают время (async_views).
+        if response.is_rendered:
+            return response
+        started = time.perf_counter()
+
+        def record(response):
+            request.metrics.template_seconds += (
+                time.perf_counter() - started
+            )
+
+        response.add_post_render_callback(record)
+        return response
+
+    def check_budget(self, view_name, queries):
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is None or queries <= budget:
+            return
+        message = (f'{view_name}: {queries} SQL-запросов '
+                   f'при бюджете {budget}')
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class ReplicaMiddleware:
+    """Включает чтение с реплик на время запроса.
+
+    Клиент, выполнивший запись, закрепляется за основной базой cookie
+    на REPLICA_PIN_SECONDS секунд.
+    """
+
+    cookie_name = 'primary_db'
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = begin_request(self.cookie_name in request.COOKIES)
+        try:
+            response = self.get_response(request)
+            return self.pin(response)
+        finally:
+            end_request(token)
+
+    async def __acall__(self, request):
+        token = begin_request(self.cookie_name in request.COOKIES)
+        try:
+            response = await self.get_response(request)
+            return self.pin(response)
+        finally:
+            end_request(token)
+
+    def pin(self, response):
+        if get_state().written:
+            response.set_cookie(
+                self.cookie_name, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную collectstatic статику раньше остальных middleware.
+
+    Файлы с хэшем в имени кэшируются браузером навсегда, остальные —
+    на STATIC_MAX_AGE секунд. Сжатая копия выбирается по Accept-Encoding.
+    """
+
+    encodings = (('br', '.br'), ('gzip', '.gz'))
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        self.root = settings.STATIC_ROOT
+        self.hashed = set(
+            getattr(staticfiles_storage, 'hashed_files', {}).values()
+            if self.root else ()
+        )
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return self.serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.serve(request) or await self.get_response(request)
+
+    def serve(self, request):
+        name = self.file_name(request)
+        if name is None:
+            return None
+        try:
+            path = Path(safe_join(self.root, name))
+        except SuspiciousFileOperation:
+            return None
+        if not path.is_file():
+            return None
+        modified = path.stat().st_mtime
+        if not was_modified_since(
+                request.META.get('HTTP_IF_MODIFIED_SINCE'), modified):
+            response = HttpResponseNotModified()
+        else:
+            response = self.file_response(request, path)
+        response['Last-Modified'] = http_date(modified)
+        response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = (
+            f'public, max-age={settings.STATIC_IMMUTABLE_MAX_AGE}, immutable'
+            if name in self.hashed
+            else f'public, max-age={settings.STATIC_MAX_AGE}'
+        )
+        return response
+
+    def file_name(self, request):
+        if (not self.root or request.method not in ('GET', 'HEAD')
+                or not request.path.startswith(settings.STATIC_URL)):
+            return None
+        name = request.path[len(settings.STATIC_URL):]
+        # Сжатые копии отдаются только вместо оригинала.
+        if name.endswith(tuple(suffix for _, suffix in self.encodings)):
+            return None
+        return name
+
+    def file_response(self, request, path):
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        served, encoding = path, None
+        for name, suffix in self.encodings:
+            variant = path.with_name(path.name + suffix)
+            if name in accepted and variant.is_file():
+                served, encoding = variant, name
+                break
+        response = FileResponse(
+            served.open('rb'),
+            content_type=(
+                mimetypes.guess_type(path.name)[0]
+                or 'application/octet-stream'
+            ),
+        )
+        del response['Content-Disposition']
+        if encoding:
+            response['Content-Encoding'] = encoding
+        return response
@@ -1,18 +1,49 @@
+import time
+
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.shortcuts import redirect, get_object_or_404
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import patch_cache_control
 
+from .cache import get_feed_cache, get_feed_timeout, make_feed_key
 from .forms import CommentForm, PostForm
 from .models import Comment, Post
+from .paginators import CursorPaginator
+
+
+class CachedObjectMixin:
+    """Загружает объект view один раз за запрос."""
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+
+class AuthorPermissionMixin(CachedObjectMixin):
+    """Права на объект: изменять и удалять его может только автор.
 
+    Авторство проверяется по author_id, без загрузки автора.
+    """
 
-class OnlyAuthorMixin(UserPassesTestMixin):
+    def is_author(self):
+        # Объект загружается и для анонимов: несуществующий даёт 404.
+        author_id = self.get_object().author_id
+        user = self.request.user
+        return user.is_authenticated and author_id == user.pk
+
+
+class OnlyAuthorMixin(AuthorPermissionMixin, UserPassesTestMixin):
     """Проверка на авторство."""
 
     def test_func(self):
         """Проверка на авторство."""
-        object = self.get_object()
-        return object.author == self.request.user
+        return self.is_author()
 
     def handle_no_permission(self):
         """Перенаправляет неавторов."""
@@ -34,19 +65,84 @@ class CommentMixin:
     pk_field = 'comment_id'
     pk_url_kwarg = 'comment_id'
 
-    def get_object(self):
-        return get_object_or_404(
-            Comment,
-            pk=self.kwargs.get('comment_id'),
-            post__id=self.kwargs.get('post_id'))
+    def get_queryset(self):
+        return Comment.objects.filter(post_id=self.kwargs.get('post_id'))
 
     def get_success_url(self):
         return reverse('blog:post_detail',
                        kwargs={'post_id': self.kwargs.get('post_id')})
 
 
-class PostDispatchMixin:
+class PostDispatchMixin(AuthorPermissionMixin):
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        if not self.is_author():
             return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
+
+
+class PostPaginationMixin:
+    """Выбор режима пагинации ленты: offset или cursor."""
+
+    paginate_by = settings.POST_COUNT_ON_PAGE
+    pagination_mode = settings.POST_PAGINATION_MODE
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.pagination_mode != 'cursor':
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidPage:
+            raise Http404('Страница не найдена')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class FeedCacheMixin:
+    """Кэширует отрендеренные страницы ленты для анонимных посетителей.
+
+    Время жизни страницы ограничено моментом ближайшей отложенной
+    публикации в этой ленте, чтобы она появилась вовремя.
+    """
+
+    def get_feed_cache_key(self):
+        return make_feed_key(
+            self.request.resolver_match.view_name,
+            self.request.GET.urlencode(),
+            **self.kwargs
+        )
+
+    def get_schedule_filters(self):
+        """Фильтры постов ленты для поиска отложенных публикаций."""
+        return {}
+
+    def get_feed_cache_timeout(self):
+        return get_feed_timeout(**self.get_schedule_filters())
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+        key = self.get_feed_cache_key()
+        cached = get_feed_cache().get(key)
+        if cached is not None:
+            content, expires = cached
+            response = HttpResponse(content)
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=max(int(expires - time.time()), 0)
+            )
+            return response
+        response = super().get(request, *args, **kwargs)
+        timeout = self.get_feed_cache_timeout()
+        patch_cache_control(response, public=True, max_age=timeout)
+
+        def store(response):
+            get_feed_cache().set(
+                key, (response.content, time.time() + timeout), timeout
+            )
+
+        response.add_post_render_callback(store)
+        return response
@@ -1,5 +1,9 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -42,6 +46,10 @@ class Category(PublishedModel):
     def __str__(self):
         return self.title[:MAX_LENGHT_FOR_DISPLAY]
 
+    def delete(self, *args, **kwargs):
+        with collect_deleting_posts():
+            return super().delete(*args, **kwargs)
+
 
 class Location(PublishedModel):
     name = models.CharField(
@@ -57,6 +65,26 @@ class Location(PublishedModel):
         return self.name[:MAX_LENGHT_FOR_DISPLAY]
 
 
+# pk постов, удаляемых в текущем контексте (заполняет сигнал pre_delete).
+deleting_posts = ContextVar('deleting_posts', default=None)
+
+
+@contextmanager
+def collect_deleting_posts():
+    """Пока блок выполняется, pre_delete запоминает удаляемые посты."""
+    token = deleting_posts.set(set())
+    try:
+        yield
+    finally:
+        deleting_posts.reset(token)
+
+
+class PostQuerySet(models.QuerySet):
+    def delete(self):
+        with collect_deleting_posts():
+            return super().delete()
+
+
 class Post(PublishedModel):
     title = models.CharField(
         'Название',
@@ -90,16 +118,64 @@ class Post(PublishedModel):
         'Изображение',
         upload_to='posts_images',
         blank=True)
+    image_variants = models.JSONField(
+        'Копии изображения',
+        default=dict,
+        blank=True,
+        editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        default=timezone.now,
+        editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                name='post_published_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_feed_idx',
+            ),
+            # Список публикаций в админке: все посты по дате.
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_admin_list_idx',
+            ),
+            # Водяной знак ETag: последнее изменение постов.
+            models.Index(
+                fields=('updated_at',),
+                name='post_updated_at_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title[:MAX_LENGHT_FOR_DISPLAY]
 
+    def delete(self, *args, **kwargs):
+        with collect_deleting_posts():
+            return super().delete(*args, **kwargs)
+
 
 class Comment(models.Model):
     text = models.TextField('Текст комментария')
@@ -123,6 +199,84 @@ class Comment(models.Model):
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+            models.Index(
+                fields=('-created_at', '-id'),
+                name='comment_admin_list_idx',
+            ),
+        )
 
     def __str__(self):
         return f'Комментарий пользователя {self.author}'
+
+
+class ImageJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Обрабатывается'),
+        (DONE, 'Готово'),
+        (FAILED, 'Ошибка'),
+    )
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Публикация'
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'обработка изображения'
+        verbose_name_plural = 'Обработка изображений'
+        ordering = ('created_at',)
+        default_related_name = 'image_jobs'
+        indexes = (
+            models.Index(
+                fields=('status', 'created_at'),
+                name='imagejob_status_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id}: {self.get_status_display()}'
+
+
+class SearchTerm(models.Model):
+    term = models.CharField('Основа слова', max_length=64)
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Публикация'
+    )
+    weight = models.PositiveIntegerField('Вес', default=1)
+
+    class Meta:
+        verbose_name = 'поисковый термин'
+        verbose_name_plural = 'Поисковый индекс'
+        default_related_name = 'search_terms'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('term', 'post'),
+                name='unique_search_term_post',
+            ),
+        )
+
+    def __str__(self):
+        return self.term
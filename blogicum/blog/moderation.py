@@ -0,0 +1,121 @@
+"""Массовая модерация постов и комментариев пакетами UPDATE/DELETE.
+
+Каждый пакет — отдельная короткая транзакция по списку pk, поэтому
+таблица не блокируется надолго. UPDATE не вызывает сигналов моделей,
+так что кэш ленты сбрасывается здесь же. Удаление идёт через
+QuerySet.delete(): каскады на любую глубину, SET_NULL и сигналы
+(счётчики комментариев, поисковый индекс) работают как при удалении
+из админки.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_generation
+from .models import Comment, Post
+
+POST_ACTIONS = ('publish', 'unpublish', 'recategorize', 'delete')
+COMMENT_ACTIONS = ('delete',)
+
+
+class ModerationError(Exception):
+    pass
+
+
+def filter_posts(queryset=None, author=None, category=None,
+                 date_from=None, date_to=None):
+    """Посты по автору, категории (slug) и диапазону pub_date."""
+    if queryset is None:
+        queryset = Post.objects.all()
+    if author:
+        queryset = queryset.filter(author__username=author)
+    if category:
+        queryset = queryset.filter(category__slug=category)
+    if date_from:
+        queryset = queryset.filter(pub_date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(pub_date__lt=date_to)
+    return queryset
+
+
+def filter_comments(queryset=None, author=None, category=None,
+                    date_from=None, date_to=None):
+    """Комментарии по автору, категории поста и диапазону created_at."""
+    if queryset is None:
+        queryset = Comment.objects.all()
+    if author:
+        queryset = queryset.filter(author__username=author)
+    if category:
+        queryset = queryset.filter(post__category__slug=category)
+    if date_from:
+        queryset = queryset.filter(created_at__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(created_at__lt=date_to)
+    return queryset
+
+
+def iter_pk_chunks(queryset, chunk_size):
+    """Списки pk по возрастанию, без OFFSET и без загрузки объектов."""
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        chunk = list(
+            (pks if last is None else pks.filter(pk__gt=last))[:chunk_size]
+        )
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
+
+
+def _delete(model, pks):
+    """Удаляет пакет с зависимыми объектами, возвращает число строк model."""
+    _, rows = model.objects.filter(pk__in=pks).delete()
+    return rows.get(model._meta.label, 0)
+
+
+def _apply_post_chunk(pks, action, category):
+    chunk = Post.objects.filter(pk__in=pks)
+    now = timezone.now()
+    if action == 'publish':
+        return chunk.update(is_published=True, updated_at=now)
+    if action == 'unpublish':
+        return chunk.update(is_published=False, updated_at=now)
+    if action == 'recategorize':
+        return chunk.update(category=category, updated_at=now)
+    return _delete(Post, pks)
+
+
+def _apply_comment_chunk(pks, action, category):
+    return _delete(Comment, pks)
+
+
+def moderate(queryset, action, category=None, chunk_size=None,
+             progress=None):
+    """Применяет action к queryset пакетами.
+
+    progress(rows, seconds) вызывается после каждого пакета.
+    Возвращает число затронутых строк и затраченное время.
+    """
+    model = queryset.model
+    actions = POST_ACTIONS if model is Post else COMMENT_ACTIONS
+    if action not in actions:
+        raise ModerationError(
+            f'Действие {action} недоступно для '
+            f'{model._meta.verbose_name_plural}'
+        )
+    if action == 'recategorize' and category is None:
+        raise ModerationError('Не указана новая категория')
+    apply_chunk = (
+        _apply_post_chunk if model is Post else _apply_comment_chunk)
+    chunk_size = chunk_size or settings.MODERATION_CHUNK_SIZE
+    rows, started = 0, time.perf_counter()
+    for pks in iter_pk_chunks(queryset, chunk_size):
+        with transaction.atomic():
+            rows += apply_chunk(pks, action, category)
+        bump_generation()
+        if progress:
+            progress(rows, time.perf_counter() - started)
+    return rows, time.perf_counter() - started
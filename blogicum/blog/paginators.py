@@ -0,0 +1,191 @@
+import base64
+import collections.abc
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import (
+    EmptyPage, InvalidPage, PageNotAnInteger, Paginator
+)
+from django.db import connections, router
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+def encode_cursor(value, pk):
+    raw = f'{value.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        value, pk = base64.urlsafe_b64decode(padded).decode().split('|')
+        return datetime.fromisoformat(value), int(pk)
+    except (ValueError, UnicodeDecodeError) as error:
+        raise InvalidCursor('Некорректный курсор') from error
+
+
+class CursorPage(collections.abc.Sequence):
+    """Страница курсорной пагинации."""
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинация по ключу (field, id) без COUNT и OFFSET."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, per_page, field='pub_date',
+                 descending=True):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.field = field
+        self.descending = descending
+
+    def _ordering(self, reverse=False):
+        descending = self.descending != reverse
+        prefix = '-' if descending else ''
+        return f'{prefix}{self.field}', f'{prefix}id'
+
+    def _seek(self, cursor, reverse=False):
+        value, pk = decode_cursor(cursor)
+        lookup = 'lt' if self.descending != reverse else 'gt'
+        return (
+            Q(**{f'{self.field}__{lookup}': value})
+            | Q(**{self.field: value, f'id__{lookup}': pk})
+        )
+
+    def _cursor_for(self, obj):
+        if isinstance(obj, dict):
+            return encode_cursor(obj[self.field], obj['id'])
+        return encode_cursor(getattr(obj, self.field), obj.pk)
+
+    def page(self, after=None, before=None):
+        """Возвращает страницу после курсора after или перед before."""
+        queryset = self.object_list
+        if before:
+            queryset = queryset.filter(self._seek(before, reverse=True))
+            queryset = queryset.order_by(*self._ordering(reverse=True))
+        else:
+            if after:
+                queryset = queryset.filter(self._seek(after))
+            queryset = queryset.order_by(*self._ordering())
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if before:
+            objects.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(after)
+        return CursorPage(
+            objects,
+            self,
+            self._cursor_for(objects[-1]) if has_next and objects else None,
+            self._cursor_for(objects[0]) if has_previous and objects else None,
+        )
+
+
+def estimate_rows(model):
+    """Примерное число строк таблицы без COUNT(*) или None."""
+    alias = router.db_for_read(model)
+    connection = connections[alias]
+    table = connection.ops.quote_name(model._meta.db_table)
+    queries = {
+        'postgresql': ('SELECT reltuples::bigint FROM pg_class '
+                       'WHERE oid = %s::regclass', [model._meta.db_table]),
+        'sqlite': (f'SELECT MAX(rowid) FROM {table}', []),
+        'mysql': ('SELECT table_rows FROM information_schema.tables '
+                  'WHERE table_schema = DATABASE() AND table_name = %s',
+                  [model._meta.db_table]),
+    }
+    if connection.vendor not in queries:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(*queries[connection.vendor])
+        row = cursor.fetchone()
+    return row[0] if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинация больших таблиц без полного COUNT(*).
+
+    Для таблицы без фильтров берётся оценка из статистики БД, если она
+    больше ESTIMATED_COUNT_THRESHOLD (is_estimate); отфильтрованный
+    queryset считается не дальше этого порога (is_lower_bound).
+
+    При неточном числе номер страницы не сверяется с num_pages: запрос
+    строки сразу за страницей показывает, есть ли следующая, и число
+    поднимается до уже известного. Так страницы за порогом
+    остаются доступны по ссылке «следующая».
+    """
+
+    is_estimate = False
+    is_lower_bound = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        threshold = settings.ESTIMATED_COUNT_THRESHOLD
+        if not queryset.query.where:
+            estimate = estimate_rows(queryset.model)
+            if estimate is not None and estimate > threshold:
+                self.is_estimate = True
+                return estimate
+        count = queryset.order_by()[:threshold + 1].count()
+        self.is_lower_bound = count > threshold
+        return count
+
+    def is_exact(self):
+        self.count  # Флаги неточности выставляет подсчёт.
+        return not (self.is_estimate or self.is_lower_bound)
+
+    def page(self, number):
+        if self.is_exact():
+            return super().page(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы должен быть целым')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if self.object_list[top:top + 1].exists():
+            self.count = max(self.count, top + 1)
+        else:
+            # Последняя страница: теперь число строк известно точно.
+            count = bottom + self.object_list.order_by()[bottom:top].count()
+            if count == bottom and number > 1:
+                raise EmptyPage('На этой странице нет результатов')
+            self.count = count
+            self.is_estimate = self.is_lower_bound = False
+        self.__dict__.pop('num_pages', None)
+        return self._get_page(self.object_list[bottom:top], number, self)
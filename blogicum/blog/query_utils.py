@@ -1,8 +1,11 @@
-from django.db.models import Count
+from django.conf import settings
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
-from .models import Category, Post
+from .models import Category, Comment, Post
+from .paginators import CursorPaginator
 
 
 def get_objects_category_or_404(self):
@@ -13,19 +16,67 @@ def get_objects_category_or_404(self):
     )
 
 
+def published_filter():
+    """Условие видимости поста для всех, кроме автора."""
+    return Q(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=timezone.now()
+    )
+
+
 def get_posts_queryset(
         manager=Post.objects,
-        show_hidden=True,
-        annotate=True):
+        show_hidden=True):
     queryset = manager.select_related('location', 'author', 'category')
     if not show_hidden:
-        queryset = queryset.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now()
-        )
-    if annotate:
-        queryset = queryset.annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
-    return queryset
+        queryset = queryset.filter(published_filter())
+    return queryset.order_by('-pub_date')
+
+
+def get_visible_post_or_404(post_id, user):
+    """Пост вместе со связанными объектами одним запросом.
+
+    Неопубликованный пост доступен только автору, проверка выполняется в БД.
+    """
+    visible = published_filter()
+    if user.is_authenticated:
+        visible |= Q(author=user)
+    return get_object_or_404(
+        get_posts_queryset().filter(visible),
+        pk=post_id
+    )
+
+
+def get_comments_page(post, after=None):
+    """Очередная порция комментариев поста в порядке добавления."""
+    return CursorPaginator(
+        post.comments.select_related('author'),
+        settings.COMMENT_COUNT_ON_PAGE,
+        field='created_at',
+        descending=False
+    ).page(after=after)
+
+
+def count_comments_subquery():
+    """Фактическое число комментариев поста для сверки счётчика."""
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0
+    )
+
+
+def refresh_comment_counts(queryset=None):
+    """Пересчитывает comment_count одним UPDATE и обновляет updated_at."""
+    if queryset is None:
+        queryset = Post.objects.all()
+    return queryset.update(
+        comment_count=count_comments_subquery(),
+        updated_at=timezone.now(),
+    )
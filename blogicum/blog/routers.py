@@ -0,0 +1,59 @@
+"""Маршрутизация запросов чтения на реплики базы данных."""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+
+# Запись в эти приложения закрепляет клиента за основной базой. Служебные
+# таблицы (DatabaseCache пишет от имени django_cache) не закрепляют:
+# иначе каждый промах кэша у анонима ставил бы cookie на публичный ответ.
+PINNING_APPS = ('blog', 'auth', 'sessions')
+
+_state = ContextVar('replica_state', default=None)
+
+
+class ReplicaState:
+    def __init__(self, pinned):
+        self.pinned = pinned
+        self.written = False
+
+
+def begin_request(pinned=False):
+    """Разрешает чтение с реплик до end_request, если клиент не закреплён."""
+    return _state.set(ReplicaState(pinned))
+
+
+def end_request(token):
+    _state.reset(token)
+
+
+def get_state():
+    return _state.get()
+
+
+class ReplicaRouter:
+    """Модели блога читаются с реплик, запись идёт в основную базу.
+
+    Реплики используются только внутри HTTP-запроса (ReplicaMiddleware):
+    команды и воркеры всегда работают с основной базой. После первой
+    записи запрос и следующие REPLICA_PIN_SECONDS секунд клиента
+    закрепляются за основной базой, чтобы автор видел свои изменения.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = get_state()
+        if (not settings.DATABASE_REPLICAS or state is None or state.pinned
+                or model._meta.app_label != 'blog'):
+            return None
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = get_state()
+        if state is not None and model._meta.app_label in PINNING_APPS:
+            state.pinned = state.written = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -0,0 +1,117 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, Count, IntegerField, Sum, When
+
+from .models import SearchTerm
+from .stemmer import stem
+
+WORD_RE = re.compile(r'\w{2,}')
+FTS_TABLE = 'blog_post_fts'
+TITLE_WEIGHT = 3
+
+
+def tokenize(text):
+    return [stem(word) for word in WORD_RE.findall(text.lower())]
+
+
+class TableBackend:
+    """Инвертированный индекс в таблице SearchTerm."""
+
+    def index(self, post):
+        weights = Counter()
+        for term in tokenize(post.title):
+            weights[term] += TITLE_WEIGHT
+        for term in tokenize(post.text):
+            weights[term] += 1
+        with transaction.atomic():
+            SearchTerm.objects.filter(post_id=post.pk).delete()
+            SearchTerm.objects.bulk_create(
+                SearchTerm(post_id=post.pk, term=term[:64], weight=weight)
+                for term, weight in weights.items()
+            )
+
+    def remove(self, post_id):
+        SearchTerm.objects.filter(post_id=post_id).delete()
+
+    def search(self, queryset, terms):
+        return queryset.filter(search_terms__term__in=terms).annotate(
+            rank=Sum('search_terms__weight'),
+            matched=Count('search_terms__term', distinct=True),
+        ).filter(matched=len(terms)).order_by('-rank', '-pub_date')
+
+
+class Fts5Backend:
+    """Полнотекстовый индекс SQLite FTS5 по основам слов."""
+
+    def index(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                f'VALUES (%s, %s, %s)',
+                [post.pk,
+                 ' '.join(tokenize(post.title)),
+                 ' '.join(tokenize(post.text))]
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id]
+            )
+
+    def search(self, queryset, terms):
+        match = ' '.join(f'"{term}"' for term in terms)
+        # Фильтр видимости применяется до LIMIT: иначе скрытые посты
+        # занимали бы места в выдаче.
+        visible_sql, visible_params = queryset.order_by().values(
+            'pk').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid IN ({visible_sql}) '
+                f'ORDER BY bm25({FTS_TABLE}, {TITLE_WEIGHT}.0, 1.0) '
+                f'LIMIT %s',
+                [match, *visible_params, settings.SEARCH_RESULTS_LIMIT]
+            )
+            post_ids = [row[0] for row in cursor.fetchall()]
+        if not post_ids:
+            return queryset.none()
+        return queryset.filter(pk__in=post_ids).order_by(Case(
+            *[When(pk=pk, then=position)
+              for position, pk in enumerate(post_ids)],
+            output_field=IntegerField(),
+        ))
+
+
+BACKENDS = {
+    'table': TableBackend,
+    'fts5': Fts5Backend,
+}
+
+
+@lru_cache(maxsize=None)
+def _fts5_installed():
+    return (connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names())
+
+
+def get_search_backend():
+    name = settings.SEARCH_BACKEND
+    if name == 'auto':
+        name = 'fts5' if _fts5_installed() else 'table'
+    return BACKENDS[name]()
+
+
+def search_posts(queryset, query):
+    """Посты из queryset, содержащие все слова запроса, по релевантности."""
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return queryset.none()
+    return get_search_backend().search(queryset, terms)
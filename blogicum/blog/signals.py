@@ -0,0 +1,127 @@
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_generation
+from .images import variants_outdated
+from .lookups import category_cache, profile_cache
+from .middleware import install_query_tracking
+from .models import Category, Comment, Location, Post, deleting_posts
+from .search import get_search_backend
+from .tasks import enqueue_image_job
+
+User = get_user_model()
+
+
+# Изменение комментария обновляет updated_at поста: от него зависят
+# ETag страниц (blog.freshness) и кэш карточек.
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    changes = {'updated_at': timezone.now()}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+
+
+@receiver(pre_delete, sender=Post)
+def mark_post_deleting(sender, instance, **kwargs):
+    # Внутри Post.delete() и QuerySet.delete() постов: комментарии
+    # удаляемого поста не обновляют его, иначе удаление стоит запроса
+    # на комментарий. Набор живёт только до конца удаления.
+    deleting = deleting_posts.get()
+    if deleting is not None:
+        deleting.add(instance.pk)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    if instance.post_id in (deleting_posts.get() or ()):
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F('comment_count') - 1, 0),
+        updated_at=timezone.now(),
+    )
+
+
+@receiver((post_save, post_delete), sender=Post)
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Location)
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_feed_cache(sender, **kwargs):
+    bump_generation()
+
+
+@receiver(post_save, sender=Post)
+def schedule_post_image_variants(sender, instance, raw, **kwargs):
+    if not raw and variants_outdated(instance):
+        enqueue_image_job(instance)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, raw, **kwargs):
+    if not raw:
+        get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_category_cache(sender, **kwargs):
+    category_cache.invalidate()
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_profile_cache(sender, update_fields=None, **kwargs):
+    # Вход пользователя обновляет только last_login.
+    if update_fields != frozenset({'last_login'}):
+        profile_cache.invalidate()
+
+
+@receiver(pre_save, sender=Post)
+def touch_post(sender, instance, raw, **kwargs):
+    # Не auto_now: фикстуры без updated_at должны загружаться.
+    if not raw:
+        instance.updated_at = timezone.now()
+
+
+@receiver((post_save, pre_delete), sender=Category)
+@receiver((post_save, pre_delete), sender=Location)
+@receiver(post_save, sender=User)
+def touch_post_cards(sender, instance, update_fields=None, **kwargs):
+    """Меняет версию закэшированных карточек постов с этим объектом."""
+    if kwargs.get('raw') or update_fields == frozenset({'last_login'}):
+        return
+    field = {Category: 'category', Location: 'location', User: 'author'}
+    if Post.objects.filter(**{field[sender]: instance}).update(
+            updated_at=timezone.now()):
+        bump_generation()
+
+
+@receiver(connection_created)
+def track_connection_queries(sender, connection, **kwargs):
+    # Соединения потоков sync_to_async открываются вне middleware.
+    install_query_tracking(connection)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Выставляет PRAGMA из настроек базы на новом соединении SQLite."""
+    pragmas = connection.settings_dict.get('PRAGMAS')
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    for name, value in pragmas.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
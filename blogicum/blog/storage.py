@@ -0,0 +1,193 @@
+"""Хранилище статики: хэши в именах, урезанный CSS и сжатые копии.
+
+Всё считается один раз при collectstatic, отдаёт файлы
+StaticFilesMiddleware.
+"""
+import gzip
+import re
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.ico', '.json', '.txt', '.xml')
+
+# Сжатая копия сохраняется, только если она меньше оригинала хотя бы на 5%.
+MIN_RATIO = 0.95
+
+_STRUCTURE_RE = re.compile(
+    r'/\*.*?\*/|"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[{};]', re.S)
+_NOT_RE = re.compile(r':not\((?:[^()]|\([^()]*\))*\)')
+_CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+_WORD_RE = re.compile(r'[\w-]+')
+
+
+def used_class_names():
+    """Слова из шаблонов и модулей проекта и django_bootstrap5.
+
+    Лишние слова только оставляют лишние правила, поэтому берётся всё,
+    что похоже на имя класса.
+    """
+    directories = [
+        Path(directory)
+        for config in settings.TEMPLATES
+        for directory in config['DIRS']
+    ]
+    directories += [
+        Path(config.path) for config in apps.get_app_configs()
+        if not config.name.startswith('django.')
+    ]
+    names = set()
+    for directory in directories:
+        for path in directory.rglob('*'):
+            if path.suffix in ('.html', '.py', '.txt'):
+                names.update(_WORD_RE.findall(
+                    path.read_text(encoding='utf-8', errors='ignore')))
+    return names
+
+
+class ClassFilter:
+    """Проверяет, может ли селектор совпасть с разметкой проекта."""
+
+    def __init__(self, names, safelist=()):
+        self.names = names
+        self.patterns = [
+            pattern for pattern in safelist if '*' in pattern]
+        self.names.update(
+            pattern for pattern in safelist if '*' not in pattern)
+
+    def is_used(self, name):
+        return name in self.names or any(
+            fnmatchcase(name, pattern) for pattern in self.patterns)
+
+    def keeps(self, selector):
+        # Классы внутри :not() селектор не ограничивают.
+        selector = _NOT_RE.sub('', selector)
+        return all(map(self.is_used, _CLASS_RE.findall(selector)))
+
+
+def _parse(css, position=0):
+    """Правила до закрывающей скобки блока: список (prelude, body).
+
+    body — строка объявлений, список вложенных правил для at-правил
+    или None для @charset и комментариев-лицензий.
+    """
+    rules, start = [], position
+    while True:
+        match = _STRUCTURE_RE.search(css, position)
+        if match is None:
+            return rules, len(css)
+        token, position = match.group(), match.end()
+        if token.startswith('/*'):
+            if not css[start:match.start()].strip():
+                if token.startswith('/*!'):
+                    rules.append((token, None))
+                start = position
+        elif token == ';':
+            rules.append((css[start:position].strip(), None))
+            start = position
+        elif token == '}':
+            return rules, position
+        elif token == '{':
+            prelude = css[start:match.start()].strip()
+            if prelude.startswith('@'):
+                body, position = _parse(css, position)
+            else:
+                body_start = position
+                position = _skip_block(css, position)
+                body = css[body_start:position - 1]
+            rules.append((prelude, body))
+            start = position
+
+
+def _skip_block(css, position):
+    """Позиция сразу после закрывающей скобки блока объявлений."""
+    for match in _STRUCTURE_RE.finditer(css, position):
+        if match.group() == '}':
+            return match.end()
+    return len(css)
+
+
+def _render(rules, class_filter):
+    output = []
+    for prelude, body in rules:
+        if body is None:
+            output.append(prelude)
+        elif isinstance(body, list):
+            inner = _render(body, class_filter)
+            if inner:
+                output.append(f'{prelude}{{{inner}}}')
+        else:
+            selectors = [
+                selector for selector in prelude.split(',')
+                if class_filter.keeps(selector)
+            ]
+            if selectors:
+                output.append(f'{",".join(selectors)}{{{body}}}')
+    return ''.join(output)
+
+
+def trim_css(css, class_filter):
+    """Удаляет из минифицированного CSS правила для неиспользуемых классов."""
+    return _render(_parse(css)[0], class_filter)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest-хранилище, которое урезает CSS_TRIM_FILES и сохраняет
+    рядом с каждым хэшированным файлом .gz и, если установлен brotli, .br.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run, **options)
+            return
+        self.trim(paths)
+        hashed_names = {}
+        for name, hashed_name, processed in super().post_process(
+                paths, dry_run, **options):
+            if not isinstance(processed, Exception):
+                hashed_names[name] = hashed_name
+            yield name, hashed_name, processed
+        for hashed_name in hashed_names.values():
+            if hashed_name.endswith(COMPRESSIBLE):
+                self.compress(hashed_name)
+
+    def trim(self, paths):
+        """Перезаписывает копии CSS_TRIM_FILES урезанными исходниками.
+
+        Исходник читается из папки приложения, а не из STATIC_ROOT, чтобы
+        правила, снова понадобившиеся шаблонам, вернулись.
+        """
+        class_filter = ClassFilter(
+            used_class_names(), settings.CSS_TRIM_SAFELIST)
+        for name in settings.CSS_TRIM_FILES:
+            if name not in paths:
+                continue
+            storage, path = paths[name]
+            with storage.open(path) as source:
+                css = source.read().decode()
+            self.replace(name, trim_css(css, class_filter).encode())
+            paths[name] = (self, name)
+
+    def compress(self, name):
+        with self.open(name) as file:
+            content = file.read()
+        variants = {'gz': gzip.compress(content, 9, mtime=0)}
+        if brotli is not None:
+            variants['br'] = brotli.compress(content)
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(content) * MIN_RATIO:
+                self.replace(f'{name}.{suffix}', compressed)
+
+    def replace(self, name, content):
+        if self.exists(name):
+            self.delete(name)
+        self._save(name, ContentFile(content))
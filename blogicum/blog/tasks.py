@@ -0,0 +1,72 @@
+import traceback
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from .cache import bump_generation
+from .images import mark_variants_failed, refresh_variants
+from .models import ImageJob
+
+
+def enqueue_image_job(post):
+    """Ставит пост в очередь на обработку изображения, если его там нет."""
+    if not post.image_jobs.filter(
+            status__in=(ImageJob.PENDING, ImageJob.RUNNING)).exists():
+        ImageJob.objects.create(post=post)
+
+
+def claim_jobs(limit):
+    """Забирает до limit заданий; занятые другим воркером пропускаются."""
+    claimed = []
+    pending = ImageJob.objects.filter(status=ImageJob.PENDING)
+    for job_id in pending.values_list('pk', flat=True)[:limit]:
+        if ImageJob.objects.filter(
+                pk=job_id, status=ImageJob.PENDING
+        ).update(status=ImageJob.RUNNING):
+            claimed.append(job_id)
+    return claimed
+
+
+def init_worker():
+    """Инициализация дочернего процесса пула."""
+    django.setup()
+    connections.close_all()
+
+
+def process_image_job(job_id):
+    try:
+        job = ImageJob.objects.select_related('post').get(pk=job_id)
+    except ImageJob.DoesNotExist:
+        # Пост удалён, задание — вместе с ним.
+        return None
+    job.attempts += 1
+    try:
+        refresh_variants(job.post)
+    except Exception:
+        job.error = traceback.format_exc()
+        job.status = (
+            ImageJob.PENDING
+            if job.attempts < settings.IMAGE_JOB_MAX_ATTEMPTS
+            else ImageJob.FAILED
+        )
+        if job.status == ImageJob.FAILED:
+            mark_variants_failed(job.post)
+            bump_generation()
+    else:
+        job.error = ''
+        job.status = ImageJob.DONE
+        bump_generation()
+    job.save(update_fields=('attempts', 'error', 'status', 'updated_at'))
+    return job.status
+
+
+def fail_job(job_id, error):
+    """Отмечает задание, упавшее вне обработки изображения."""
+    ImageJob.objects.filter(pk=job_id).update(
+        status=ImageJob.FAILED,
+        error=error,
+        updated_at=timezone.now(),
+    )
+    return ImageJob.FAILED
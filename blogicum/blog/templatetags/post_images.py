@@ -0,0 +1,40 @@
+from django import template
+from django.core.files.storage import default_storage
+
+from ..images import variants_outdated
+
+register = template.Library()
+
+IMAGE_SIZES = '(max-width: 40rem) 100vw, 40rem'
+
+
+def _srcset(images, key):
+    return ', '.join(
+        f'{default_storage.url(image[key])} {image["width"]}w'
+        for image in images
+    )
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post):
+    """Адаптивное изображение поста с srcset по готовым копиям.
+
+    Копии прежнего изображения не показываются: до обработки нового
+    пост выводит оригинал с пометкой об обработке.
+    """
+    variants = {} if variants_outdated(post) else post.image_variants
+    images = variants.get('images')
+    context = {
+        'post': post,
+        'sizes': IMAGE_SIZES,
+        'failed': variants.get('failed', False),
+    }
+    if images:
+        context.update(
+            src=default_storage.url(images[-1]['fallback']),
+            srcset=_srcset(images, 'fallback'),
+            webp_srcset=_srcset(images, 'webp'),
+            width=variants['width'],
+            height=variants['height'],
+        )
+    return context
@@ -0,0 +1,293 @@
+"""Потоковый экспорт и импорт данных блога в формате NDJSON.
+
+Каждая строка файла — запись в формате фикстур Django:
+{"model": "blog.post", "pk": 1, "fields": {...}}.
+"""
+import bisect
+import gzip
+import json
+import os
+import sys
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from .cache import bump_generation
+from .models import Category, Comment, Location, Post
+from .query_utils import refresh_comment_counts
+
+User = get_user_model()
+
+TRANSFER_MODELS = (User, Category, Location, Post, Comment)
+NATURAL_KEYS = {User: User.USERNAME_FIELD, Category: 'slug'}
+
+
+class TransferError(Exception):
+    pass
+
+
+def open_stream(path, mode):
+    """Открывает файл в двоичном режиме; .gz сжимается, «-» — stdin/stdout."""
+    if path == '-':
+        return (sys.stdin if 'r' in mode else sys.stdout).buffer
+    if path.endswith('.gz'):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} не сериализуется в JSON')
+
+
+def export_records(model, chunk_size):
+    """Строки NDJSON для всех объектов модели в порядке pk."""
+    fields = [field for field in model._meta.concrete_fields
+              if not field.primary_key]
+    rows = model._base_manager.order_by('pk').values_list(
+        'pk', *(field.attname for field in fields))
+    label = model._meta.label_lower
+    for pk, *values in rows.iterator(chunk_size=chunk_size):
+        record = {
+            'model': label,
+            'pk': pk,
+            'fields': {
+                field.name: value for field, value in zip(fields, values)
+            },
+        }
+        yield json.dumps(
+            record, ensure_ascii=False, default=_default).encode() + b'\n'
+
+
+@contextmanager
+def preserve_auto_dates(model):
+    """Отключает auto_now/auto_now_add, чтобы сохранить даты из файла.
+
+    bulk_create, в отличие от loaddata, не вставляет «сырые» значения.
+    """
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now', False)
+              or getattr(field, 'auto_now_add', False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class PkMap:
+    """Соответствие старых pk новым: два массива int64 и бинарный поиск.
+
+    Старые ключи должны поступать по возрастанию, как их пишет экспорт.
+    """
+
+    def __init__(self):
+        self.old = array('q')
+        self.new = array('q')
+
+    def __len__(self):
+        return len(self.old)
+
+    def add(self, old, new):
+        if self.old and old <= self.old[-1]:
+            raise TransferError(
+                f'Записи должны идти по возрастанию pk: {old} после '
+                f'{self.old[-1]}'
+            )
+        self.old.append(old)
+        self.new.append(new)
+
+    def get(self, old):
+        index = bisect.bisect_left(self.old, old)
+        if index == len(self.old) or self.old[index] != old:
+            raise KeyError(old)
+        return self.new[index]
+
+    def dump(self, path, start):
+        """Дописывает в файл пары, добавленные после позиции start."""
+        pairs = array('q')
+        for index in range(start, len(self)):
+            pairs.extend((self.old[index], self.new[index]))
+        with open(path, 'ab') as file:
+            pairs.tofile(file)
+
+    @classmethod
+    def load(cls, path, count):
+        pk_map = cls()
+        pairs = array('q')
+        with open(path, 'rb') as file:
+            pairs.fromfile(file, count * 2)
+        pk_map.old = pairs[0::2]
+        pk_map.new = pairs[1::2]
+        return pk_map
+
+
+class Importer:
+    """Импорт NDJSON пакетами bulk_create с возможностью продолжения.
+
+    Новые pk выдаются подряд после максимального существующего, поэтому
+    повтор пакета после сбоя даёт те же ключи и пропускается как конфликт.
+    Пользователи и категории с уже существующими username/slug
+    сопоставляются с имеющимися записями.
+    """
+
+    def __init__(self, path, batch_size=5_000, state_path=None,
+                 resume=False):
+        self.path = path
+        self.batch_size = batch_size
+        self.state_path = state_path or f'{path}.state'
+        self.models = {
+            model._meta.label_lower: model for model in TRANSFER_MODELS}
+        self.maps = {label: PkMap() for label in self.models}
+        self.stats = {label: [0, 0.0] for label in self.models}
+        self.replaying = resume
+        if resume:
+            self.load_state()
+        elif os.path.exists(self.state_path):
+            raise TransferError(
+                f'Найден файл состояния {self.state_path}: продолжите импорт '
+                'с --resume или удалите его.'
+            )
+        else:
+            self.state = {'offset': 0, 'models': {
+                label: {
+                    'base': model._base_manager.aggregate(
+                        base=Max('pk'))['base'] or 0,
+                    'count': 0,
+                    'mapped': 0,
+                }
+                for label, model in self.models.items()
+            }}
+
+    def map_path(self, label):
+        return f'{self.state_path}.{label}'
+
+    def load_state(self):
+        with open(self.state_path, encoding='utf-8') as file:
+            self.state = json.load(file)
+        for label, model_state in self.state['models'].items():
+            if model_state['mapped']:
+                self.maps[label] = PkMap.load(
+                    self.map_path(label), model_state['mapped'])
+
+    def save_state(self, label):
+        model_state = self.state['models'][label]
+        self.maps[label].dump(self.map_path(label), model_state['mapped'])
+        model_state['mapped'] = len(self.maps[label])
+        temporary = f'{self.state_path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(self.state, file)
+        os.replace(temporary, self.state_path)
+
+    def remove_state(self):
+        for path in [self.state_path, *map(self.map_path, self.models)]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def build(self, model, record, pk):
+        values = {}
+        for field in model._meta.concrete_fields:
+            if field.primary_key or field.name not in record['fields']:
+                continue
+            value = record['fields'][field.name]
+            if field.is_relation and value is not None:
+                label = field.related_model._meta.label_lower
+                try:
+                    value = self.maps[label].get(value)
+                except KeyError:
+                    raise TransferError(
+                        f'{record["model"]} {record["pk"]}: нет объекта '
+                        f'{label} с pk={value}'
+                    ) from None
+            elif not field.is_relation:
+                value = field.to_python(value)
+            values[field.attname] = value
+        return model(pk=pk, **values)
+
+    def flush(self, label, records):
+        started = time.perf_counter()
+        model = self.models[label]
+        model_state = self.state['models'][label]
+        natural = NATURAL_KEYS.get(model)
+        existing = {}
+        if natural:
+            existing = dict(model._base_manager.filter(
+                pk__lte=model_state['base'],
+                **{f'{natural}__in': [
+                    record['fields'][natural] for record in records]},
+            ).values_list(natural, 'pk'))
+        objects = []
+        for record in records:
+            key = record['fields'].get(natural) if natural else None
+            if key in existing:
+                self.maps[label].add(record['pk'], existing[key])
+                continue
+            model_state['count'] += 1
+            pk = model_state['base'] + model_state['count']
+            self.maps[label].add(record['pk'], pk)
+            objects.append(self.build(model, record, pk))
+        with transaction.atomic(), preserve_auto_dates(model):
+            model._base_manager.bulk_create(
+                objects, batch_size=self.batch_size,
+                ignore_conflicts=self.replaying,
+            )
+        self.replaying = False
+        self.save_state(label)
+        self.stats[label][0] += len(records)
+        self.stats[label][1] += time.perf_counter() - started
+
+    def run(self, progress=None):
+        """Импортирует файл; progress(label, rows) вызывается после пакетов."""
+        label, records = None, []
+        offset = self.state['offset']
+        with open_stream(self.path, 'rb') as stream:
+            if offset:
+                stream.seek(offset)
+            for line in stream:
+                offset += len(line)
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record['model'] not in self.models:
+                    raise TransferError(
+                        f'Неизвестная модель {record["model"]}')
+                if records and (record['model'] != label
+                                or len(records) >= self.batch_size):
+                    self.flush(label, records)
+                    if progress:
+                        progress(label, self.stats[label][0])
+                    records = []
+                label = record['model']
+                records.append(record)
+                self.state['offset'] = offset
+        if records:
+            self.flush(label, records)
+            if progress:
+                progress(label, self.stats[label][0])
+        self.finish()
+        return self.stats
+
+    def finish(self):
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), list(self.models.values()))
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+        refresh_comment_counts(Post.objects.filter(
+            pk__gt=self.state['models']['blog.post']['base']))
+        bump_generation()
+        self.remove_state()
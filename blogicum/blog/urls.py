@@ -1,14 +1,17 @@
 from django.urls import include, path
 
-from . import views
+from . import feeds, views
+from .async_views import read_view
 
 app_name = 'blog'
 
 posts_urls = [
-    path('<int:post_id>/', views.PostDetailView.as_view(),
+    path('<int:post_id>/', read_view(views.PostDetailView),
          name='post_detail'),
     path('<int:post_id>/comment/', views.CommentCreateView.as_view(),
          name='add_comment'),
+    path('<int:post_id>/comments/', views.CommentListView.as_view(),
+         name='comments'),
     path('<int:post_id>/delete_comment/<int:comment_id>/',
          views.CommentDeleteView.as_view(),
          name='delete_comment'),
@@ -23,13 +26,28 @@ posts_urls = [
          name='delete_post'),
 ]
 
+feeds_urls = [
+    path('rss/', feeds.latest_rss, name='feed_rss'),
+    path('atom/', feeds.latest_atom, name='feed_atom'),
+    path('category/<slug:category_slug>/rss/', feeds.category_rss,
+         name='category_feed_rss'),
+    path('category/<slug:category_slug>/atom/', feeds.category_atom,
+         name='category_feed_atom'),
+    path('profile/<str:username>/rss/', feeds.author_rss,
+         name='profile_feed_rss'),
+    path('profile/<str:username>/atom/', feeds.author_atom,
+         name='profile_feed_atom'),
+]
+
 urlpatterns = [
-    path('', views.PostsListView.as_view(), name='index'),
+    path('', read_view(views.PostsListView), name='index'),
     path('category/<slug:category_slug>/',
-         views.CategoryPostsListView.as_view(),
+         read_view(views.CategoryPostsListView),
          name='category_posts'),
     path('posts/', include(posts_urls)),
-    path('profile/<str:username>/', views.ProfileDetailView.as_view(),
+    path('feeds/', include(feeds_urls)),
+    path('search/', views.PostSearchView.as_view(), name='search'),
+    path('profile/<str:username>/', read_view(views.ProfileDetailView),
          name='profile'),
     path('profile_edit/', views.ProfileUpdateView.as_view(),
          name='edit_profile'),
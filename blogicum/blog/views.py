@@ -1,11 +1,14 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import Http404
-from django.shortcuts import get_object_or_404
+from django.core.paginator import InvalidPage
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
-from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.http import urlencode
 from django.views.generic import (
+    View,
     ListView,
     DetailView,
     CreateView,
@@ -13,10 +16,30 @@ from django.views.generic import (
     DeleteView,
 )
 
+from .api import serialize_comment
 from .forms import PostForm, CommentForm, ProfileEditForm
-from .models import Category, Comment, Post
-from .mixins import PostMixin, CommentMixin, PostDispatchMixin, OnlyAuthorMixin
-from .query_utils import get_posts_queryset
+from .freshness import (
+    category_page_freshness,
+    feed_page_freshness,
+    post_page_freshness,
+    profile_page_freshness,
+)
+from .lookups import get_category_or_404, get_profile_or_404
+from .models import Comment, Post
+from .mixins import (
+    PostMixin,
+    CommentMixin,
+    PostDispatchMixin,
+    OnlyAuthorMixin,
+    PostPaginationMixin,
+    FeedCacheMixin,
+)
+from .query_utils import (
+    get_comments_page,
+    get_posts_queryset,
+    get_visible_post_or_404,
+)
+from .search import search_posts
 
 User = get_user_model()
 
@@ -49,6 +72,10 @@ class PostDeleteView(PostMixin,
                      LoginRequiredMixin,
                      DeleteView):
 
+    def get_queryset(self):
+        # Шаблон подтверждения показывает местоположение.
+        return super().get_queryset().select_related('location')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = PostForm(instance=self.object)
@@ -59,32 +86,52 @@ class PostDeleteView(PostMixin,
                        kwargs={'username': self.request.user.username})
 
 
-class PostsListView(ListView):
+@method_decorator(feed_page_freshness.condition(), name='get')
+class PostsListView(FeedCacheMixin, PostPaginationMixin, ListView):
     model = Post
-    paginate_by = settings.POST_COUNT_ON_PAGE
     template_name = 'blog/index.html'
 
     def get_queryset(self):
         return get_posts_queryset(show_hidden=False)
 
 
-class ProfileDetailView(ListView):
-    model = Post
+class PostSearchView(ListView):
     paginate_by = settings.POST_COUNT_ON_PAGE
+    template_name = 'blog/search.html'
+
+    def get_search_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return search_posts(
+            get_posts_queryset(show_hidden=False),
+            self.get_search_query()
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.get_search_query()
+        context['page_query'] = urlencode({'q': context['query']}) + '&'
+        return context
+
+
+@method_decorator(profile_page_freshness.condition(), name='get')
+class ProfileDetailView(FeedCacheMixin, PostPaginationMixin, ListView):
+    model = Post
     template_name = 'blog/profile.html'
 
     def get_user_profile(self):
-        return get_object_or_404(
-            User,
-            username=self.kwargs['username']
-        )
+        return get_profile_or_404(self.kwargs['username'], self.request)
+
+    def get_schedule_filters(self):
+        return {'author__username': self.kwargs['username']}
 
     def get_queryset(self):
         user_profile = self.get_user_profile()
         if self.request.user == user_profile:
             return get_posts_queryset(manager=user_profile.posts)
         return get_posts_queryset(
-            manager=self.model.objects,
+            manager=user_profile.posts,
             show_hidden=False
         )
 
@@ -105,47 +152,65 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return reverse('blog:profile', args=[self.request.user.username])
 
 
+@method_decorator(post_page_freshness.condition(), name='get')
 class PostDetailView(DetailView):
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
     def get_object(self, *args, **kwargs):
-        post_obj = get_object_or_404(
-            Post,
-            pk=self.kwargs['post_id']
+        return get_visible_post_or_404(
+            self.kwargs['post_id'],
+            self.request.user
         )
-        if post_obj.author != self.request.user and (
-                not post_obj.is_published
-                or not post_obj.category.is_published
-                or post_obj.pub_date == timezone.now()):
-            raise Http404('Страница не найдена')
-        return post_obj
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = get_comments_page(self.object)
         return context
 
 
-class CategoryPostsListView(ListView):
-    paginate_by = settings.POST_COUNT_ON_PAGE
+class CommentListView(View):
+    """Следующая порция комментариев: HTML-фрагмент или JSON."""
+
+    def get(self, request, post_id):
+        post = get_visible_post_or_404(post_id, request.user)
+        try:
+            comments = get_comments_page(post, after=request.GET.get('after'))
+        except InvalidPage:
+            raise Http404('Страница не найдена')
+        if request.GET.get('format') == 'json':
+            return JsonResponse({
+                'comments': [
+                    serialize_comment(comment) for comment in comments
+                ],
+                'next': comments.next_cursor,
+            })
+        return render(request, 'includes/comment_list.html', {
+            'post': post,
+            'comments': comments,
+        })
+
+
+@method_decorator(category_page_freshness.condition(), name='get')
+class CategoryPostsListView(FeedCacheMixin,
+                            PostPaginationMixin,
+                            ListView):
     template_name = 'blog/category.html'
 
+    def get_schedule_filters(self):
+        return {'category__slug': self.kwargs['category_slug']}
+
     def _get_objects_category_or_404(self):
-        return get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True,
-        )
+        return get_category_or_404(
+            self.kwargs['category_slug'], self.request)
 
     def get_queryset(self):
         category = self._get_objects_category_or_404()
         return get_posts_queryset(
             manager=category.posts,
-            show_hidden=False,
-            annotate=True
+            show_hidden=False
         )
 
     def get_context_data(self, *args, **kwargs):
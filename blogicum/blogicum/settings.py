@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -24,6 +25,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.middleware.StaticFilesMiddleware',
+    'blog.middleware.MetricsMiddleware',
+    'blog.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -40,8 +44,11 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -52,14 +59,92 @@ TEMPLATES = [
     },
 ]
 
+# В продакшене скомпилированные шаблоны кэшируются в памяти процесса.
+if not DEBUG:
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader',
+         TEMPLATES[0]['OPTIONS']['loaders']),
+    ]
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
-DATABASES = {
-    'default': {
+# Профиль базы данных выбирается переменной окружения BLOGICUM_DATABASE:
+# development, production (SQLite в режиме WAL) или postgresql.
+DATABASE_PROFILES = {
+    'development': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    'production': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        # Применяются при открытии каждого соединения (blog.signals).
+        'PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,
+            'temp_store': 'MEMORY',
+        },
+    },
+    # Соединения идут через PgBouncer в режиме transaction, поэтому
+    # серверные курсоры отключены.
+    'postgresql': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('POSTGRES_DB', 'blogicum'),
+        'USER': os.environ.get('POSTGRES_USER', 'blogicum'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '6432'),
+        'CONN_MAX_AGE': 600,
+        'DISABLE_SERVER_SIDE_CURSORS': True,
+        'OPTIONS': {'connect_timeout': 5},
+    },
+}
+
+DATABASES = {
+    'default': DATABASE_PROFILES[
+        os.environ.get('BLOGICUM_DATABASE', 'development')],
+}
+
+# Реплики только для чтения через запятую в BLOGICUM_REPLICAS:
+# для SQLite — пути к файлам, для PostgreSQL — адреса серверов.
+for number, replica in enumerate(
+        filter(None, os.environ.get('BLOGICUM_REPLICAS', '').split(','))):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'NAME' if 'sqlite' in DATABASES['default']['ENGINE'] else 'HOST':
+            replica,
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'files': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+    # Общий для всех процессов кэш без внешних сервисов. Таблица
+    # создаётся командой manage.py createcachetable.
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'blogicum_cache',
+    },
+    # Фрагменты {% cache %}: карточки постов.
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'template_fragments',
+        'OPTIONS': {'MAX_ENTRIES': 10_000},
+    },
 }
 
 
@@ -91,6 +176,11 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'static'
+
+# Хэши в именах файлов, урезанный bootstrap и сжатые копии (blog.storage).
+STATICFILES_STORAGE = 'blog.storage.CompressedManifestStaticFilesStorage'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 STATICFILES_DIRS = [
@@ -115,3 +205,90 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 POST_COUNT_ON_PAGE = 10
+
+COMMENT_COUNT_ON_PAGE = 20
+
+SYNDICATION_ITEMS = 20
+
+# Асинхронные view чтения для развёртывания под ASGI.
+ASYNC_READ_VIEWS = False
+
+# 'offset' — классическая постраничная навигация с COUNT(*),
+# 'cursor' — навигация по ключу (pub_date, id) через ?after=/?before=.
+POST_PAGINATION_MODE = 'offset'
+
+# Алиас из CACHES для страниц лент и версий кэшей (BLOGICUM_FEED_CACHE).
+# Сигналы сбрасывают кэш только в процессе, сделавшем запись, поэтому
+# 'default' (locmem) годится лишь для одного процесса. При нескольких
+# воркерах нужен общий бэкенд: 'shared' (таблица в БД) или 'files'
+# на общем для воркеров диске.
+FEED_CACHE_ALIAS = os.environ.get('BLOGICUM_FEED_CACHE', 'default')
+
+FEED_CACHE_TIMEOUT = 60 * 5
+
+POST_IMAGE_WIDTHS = (320, 640, 960)
+
+POST_IMAGE_QUALITY = 82
+
+IMAGE_JOB_MAX_ATTEMPTS = 3
+
+# 'auto' — FTS5, если таблица создана миграцией, иначе 'table'.
+SEARCH_BACKEND = 'auto'
+
+SEARCH_RESULTS_LIMIT = 500
+
+# Допустимое число SQL-запросов на один запрос к view. Для правки и
+# удаления — сохранение автором, самый дорогой путь.
+QUERY_BUDGETS = {
+    'blog:index': 4,
+    'blog:category_posts': 5,
+    'blog:profile': 7,
+    'blog:post_detail': 5,
+    'blog:search': 4,
+    'blog:edit_post': 8,
+    'blog:delete_post': 10,
+    'blog:edit_comment': 5,
+    'blog:delete_comment': 6,
+    'admin:blog_post_changelist': 10,
+    'admin:blog_comment_changelist': 10,
+    'admin:blog_category_change': 12,
+}
+
+# True — превышение бюджета вызывает исключение (удобно в тестах),
+# False — только предупреждение в лог.
+QUERY_BUDGET_STRICT = False
+
+# Сколько секунд после записи клиент читает из основной базы.
+REPLICA_PIN_SECONDS = 10
+
+# LRU категорий и профилей в памяти процесса (blog.lookups).
+LOOKUP_CACHE_SIZE = 1024
+LOOKUP_CACHE_TIMEOUT = 60
+
+# Выше этого числа строк админка показывает оценку вместо COUNT(*).
+ESTIMATED_COUNT_THRESHOLD = 10_000
+
+# Сколько последних публикаций показывать на странице категории в админке.
+ADMIN_INLINE_POSTS = 20
+
+# Строк в одном пакете массовой модерации (blog.moderation).
+MODERATION_CHUNK_SIZE = 1000
+
+# CSS, из которого при collectstatic удаляются правила для классов,
+# не встречающихся в шаблонах и коде.
+CSS_TRIM_FILES = ('css/bootstrap.min.css',)
+
+# Классы, которые django_bootstrap5 собирает из частей во время рендеринга.
+CSS_TRIM_SAFELIST = (
+    'alert-*',
+    'btn-*',
+    'form-control-*',
+    'form-select-*',
+    'col-form-label-*',
+    'input-group-*',
+    'pagination-*',
+)
+
+# Cache-Control статики: файлы с хэшем в имени не меняются никогда.
+STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+STATIC_MAX_AGE = 60 * 60
@@ -3,6 +3,7 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from blog.metrics import metrics_view
 from pages.views import RegistrationView
 
 
@@ -12,10 +13,12 @@ handler500 = 'pages.views.server_error'
 urlpatterns = [
     path('', include('blog.urls'), name='blog'),
     path('pages/', include('pages.urls'), name='pages'),
+    path('api/', include('blog.api_urls')),
     path('admin/', admin.site.urls),
     path('auth/', include('django.contrib.auth.urls')),
     path('auth/registration/', RegistrationView.as_view(),
          name='registration'),
+    path('metrics/', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG:
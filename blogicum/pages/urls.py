@@ -1,10 +1,12 @@
 from django.urls import path
 
+from blog.async_views import read_view
+
 from . import views
 
 app_name = 'pages'
 
 urlpatterns = [
-    path('about/', views.About.as_view(), name='about'),
-    path('rules/', views.Rules.as_view(), name='rules'),
+    path('about/', read_view(views.About), name='about'),
+    path('rules/', read_view(views.Rules), name='rules'),
 ]
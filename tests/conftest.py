@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.test import Client
+from django.utils import timezone
+
+from blog.lookups import category_cache, profile_cache
+from blog.models import Category, Comment, Location, Post
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+    category_cache.entries.clear()
+    profile_cache.entries.clear()
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budgets(settings):
+    # В тестах превышение QUERY_BUDGETS — ошибка, а не запись в лог.
+    settings.QUERY_BUDGET_STRICT = True
+
+
+@pytest.fixture
+def author(django_user_model):
+    return django_user_model.objects.create_user(username='author')
+
+
+@pytest.fixture
+def other_user(django_user_model):
+    return django_user_model.objects.create_user(username='other')
+
+
+@pytest.fixture
+def author_client(client, author):
+    client.force_login(author)
+    return client
+
+
+@pytest.fixture
+def other_client(other_user):
+    client = Client()
+    client.force_login(other_user)
+    return client
+
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(
+        title='Категория', description='Описание', slug='category')
+
+
+@pytest.fixture
+def location(db):
+    return Location.objects.create(name='Место')
+
+
+@pytest.fixture
+def post(author, category, location):
+    return Post.objects.create(
+        title='Пост',
+        text='Текст',
+        pub_date=timezone.now() - timedelta(days=1),
+        author=author,
+        category=category,
+        location=location,
+    )
+
+
+@pytest.fixture
+def comment(post, author):
+    return Comment.objects.create(post=post, author=author, text='Комментарий')
+
+
+@pytest.fixture
+def many_comments(post, author, other_user):
+    return [
+        Comment.objects.create(
+            post=post,
+            author=author if number % 2 else other_user,
+            text=f'Комментарий {number}',
+        )
+        for number in range(30)
+    ]
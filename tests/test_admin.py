@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def make_posts(author, category, location):
+    def make(number):
+        pub_date = timezone.now() - timedelta(days=1)
+        Post.objects.bulk_create(
+            Post(
+                title=f'Пост {index}',
+                text='Текст',
+                pub_date=pub_date,
+                author=author,
+                category=category,
+                location=location,
+                is_published=bool(index % 2),
+            )
+            for index in range(number)
+        )
+    return make
+
+
+@pytest.fixture
+def threshold(settings):
+    settings.ESTIMATED_COUNT_THRESHOLD = 250
+    return settings.ESTIMATED_COUNT_THRESHOLD
+
+
+@pytest.mark.parametrize('posts', [10, 700])
+def test_post_changelist_queries_do_not_grow(
+        admin_client, make_posts, threshold, posts,
+        django_assert_num_queries):
+    make_posts(posts)
+    # Сессия, пользователь, оценка, COUNT до порога или проверка
+    # следующей страницы, страница, категории для формы действий.
+    with django_assert_num_queries(6):
+        response = admin_client.get(reverse('admin:blog_post_changelist'))
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('comments', [10, 700])
+def test_comment_changelist_queries_do_not_grow(
+        admin_client, post, author, threshold, comments,
+        django_assert_num_queries):
+    Comment.objects.bulk_create(
+        Comment(post=post, author=author, text=str(index))
+        for index in range(comments)
+    )
+    with django_assert_num_queries(5):
+        response = admin_client.get(
+            reverse('admin:blog_comment_changelist'))
+    assert response.status_code == 200
+
+
+def test_estimated_count_is_labelled(admin_client, make_posts, threshold):
+    make_posts(700)
+    response = admin_client.get(reverse('admin:blog_post_changelist'))
+    assert response.context['cl'].paginator.is_estimate
+    assert 'около 700' in response.content.decode()
+
+
+def test_pages_past_threshold_stay_reachable(
+        admin_client, make_posts, threshold):
+    make_posts(700)
+    url = reverse('admin:blog_post_changelist') + '?is_published__exact=1'
+    response = admin_client.get(url)
+    paginator = response.context['cl'].paginator
+    assert paginator.is_lower_bound
+    assert f'не менее {threshold + 1}' in response.content.decode()
+    assert 'showall' not in response.content.decode()
+    # 350 опубликованных при пороге 250 и 100 строках на странице.
+    response = admin_client.get(url + '&p=3')
+    assert 'p=4' in response.content.decode()
+    response = admin_client.get(url + '&p=4')
+    assert response.status_code == 200
+    cl = response.context['cl']
+    assert len(cl.result_list) == 50
+    assert not cl.paginator.is_lower_bound
+    assert cl.paginator.count == 350
+    response = admin_client.get(url + '&p=5')
+    assert response.status_code == 302
+
+
+def test_list_editable_save_touches_post(admin_client, post, settings):
+    # Бюджет списка — для просмотра; сохранение растёт с числом строк.
+    settings.QUERY_BUDGET_STRICT = False
+    before = post.updated_at
+    response = admin_client.post(reverse('admin:blog_post_changelist'), {
+        'form-TOTAL_FORMS': '1',
+        'form-INITIAL_FORMS': '1',
+        'form-0-id': str(post.pk),
+        '_save': 'Сохранить',
+    })
+    assert response.status_code == 302
+    post.refresh_from_db()
+    assert not post.is_published
+    assert post.updated_at > before
+
+
+def test_editable_changelist_loads_full_rows(admin_client, post):
+    response = admin_client.get(reverse('admin:blog_post_changelist'))
+    assert not response.context['cl'].result_list[0].get_deferred_fields()
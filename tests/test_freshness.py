@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def older_post(author, category):
+    return Post.objects.create(
+        title='Старый пост',
+        text='Текст',
+        pub_date=timezone.now() - timedelta(days=5),
+        author=author,
+        category=category,
+    )
+
+
+def test_deleting_older_post_changes_etag(client, post, older_post):
+    url = reverse('blog:index')
+    etag = client.get(url)['ETag']
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    older_post.delete()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+
+
+def test_watermark_does_not_count_posts(client, post):
+    url = reverse('blog:index')
+    etag = client.get(url)['ETag']
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert len(queries) == 1
+    assert not any(
+        'COUNT(' in query['sql'] for query in queries.captured_queries)
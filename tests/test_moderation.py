@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Comment, ImageJob, Post
+from blog.moderation import filter_comments, filter_posts, moderate
+from blog.search import search_posts
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def posts(author, category, location):
+    return [
+        Post.objects.create(
+            title=f'Модерация {number}',
+            text='Текст',
+            pub_date=timezone.now() - timedelta(days=1),
+            author=author,
+            category=category,
+            location=location,
+        )
+        for number in range(5)
+    ]
+
+
+@pytest.fixture
+def post_comments(posts, other_user):
+    for post in posts:
+        for number in range(3):
+            Comment.objects.create(
+                post=post, author=other_user, text=str(number))
+
+
+def test_delete_posts_removes_dependent_rows(
+        posts, post_comments, other_user, author):
+    for post in posts:
+        ImageJob.objects.create(post=post)
+    kept = Post.objects.create(
+        title='Модерация чужая', text='Текст', author=other_user,
+        pub_date=timezone.now(),
+    )
+    Comment.objects.create(post=kept, author=author, text='Останется')
+    rows, _ = moderate(
+        filter_posts(author='author'), 'delete', chunk_size=2)
+    assert rows == len(posts)
+    assert list(Post.objects.all()) == [kept]
+    assert list(Comment.objects.values_list('post_id', flat=True)) == [
+        kept.pk]
+    assert not ImageJob.objects.exists()
+    assert list(search_posts(Post.objects.all(), 'модерация')) == [kept]
+
+
+def test_delete_comments_updates_counts(posts, post_comments, other_user):
+    first = posts[0]
+    Comment.objects.create(post=first, author=first.author, text='Свой')
+    rows, _ = moderate(
+        filter_comments(author=other_user.username), 'delete', chunk_size=4)
+    assert rows == 3 * len(posts)
+    first.refresh_from_db()
+    assert first.comment_count == 1
+    assert set(Post.objects.values_list('comment_count', flat=True)) == {
+        0, 1}
+
+
+def test_unpublish_touches_posts(posts):
+    before = {post.pk: post.updated_at for post in posts}
+    rows, _ = moderate(Post.objects.all(), 'unpublish', chunk_size=2)
+    assert rows == len(posts)
+    for post in Post.objects.all():
+        assert not post.is_published
+        assert post.updated_at > before[post.pk]
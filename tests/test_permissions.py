@@ -0,0 +1,110 @@
+import pytest
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.urls import reverse
+
+from blog.models import Comment, Post, deleting_posts
+
+pytestmark = pytest.mark.django_db
+
+POST_DATA = {
+    'title': 'Новый заголовок',
+    'text': 'Новый текст',
+    'pub_date': '2026-01-01 10:00',
+}
+COMMENT_DATA = {'text': 'Новый комментарий'}
+
+
+@pytest.fixture
+def urls(post, comment, many_comments):
+    return {
+        'edit_post': reverse('blog:edit_post', args=[post.pk]),
+        'delete_post': reverse('blog:delete_post', args=[post.pk]),
+        'edit_comment': reverse(
+            'blog:edit_comment', args=[post.pk, comment.pk]),
+        'delete_comment': reverse(
+            'blog:delete_comment', args=[post.pk, comment.pk]),
+    }
+
+
+# Автор: объект, сессия, пользователь, затем форма или запись.
+# Удаление в тестовой транзакции обходится без BEGIN, поэтому в QUERY_BUDGETS
+# на запрос больше; первое сохранение поста в процессе ещё проверяет FTS5.
+@pytest.mark.parametrize('name, method, queries', [
+    ('edit_post', 'get', 5),
+    ('edit_post', 'post', 8),
+    ('delete_post', 'get', 3),
+    ('delete_post', 'post', 9),
+    ('edit_comment', 'get', 3),
+    ('edit_comment', 'post', 5),
+    ('delete_comment', 'get', 3),
+    ('delete_comment', 'post', 5),
+])
+def test_author_queries(author_client, urls, post, name, method, queries,
+                        django_assert_num_queries):
+    data = COMMENT_DATA
+    if name == 'edit_post':
+        data = {**POST_DATA, 'category': post.category_id}
+    with django_assert_num_queries(queries):
+        response = getattr(author_client, method)(
+            urls[name], data if method == 'post' else None)
+    assert response.status_code == (200 if method == 'get' else 302)
+
+
+# Не автору нужны сессия, пользователь и объект, анониму — только объект.
+@pytest.mark.parametrize('client_name, queries', [
+    ('other_client', 3),
+    ('client', 1),
+])
+@pytest.mark.parametrize('name', [
+    'edit_post', 'delete_post', 'edit_comment', 'delete_comment'])
+@pytest.mark.parametrize('method', ['get', 'post'])
+def test_non_author_queries(request, urls, post, comment, client_name,
+                            queries, name, method,
+                            django_assert_num_queries):
+    client = request.getfixturevalue(client_name)
+    data = POST_DATA if name == 'edit_post' else COMMENT_DATA
+    with django_assert_num_queries(queries):
+        response = getattr(client, method)(
+            urls[name], data if method == 'post' else None)
+    assert response.status_code == 302
+    assert response.url == reverse('blog:post_detail', args=[post.pk])
+    post.refresh_from_db()
+    comment.refresh_from_db()
+    assert post.title != POST_DATA['title']
+    assert comment.text != COMMENT_DATA['text']
+
+
+def test_author_deletes_post_with_comments(author_client, urls, post):
+    author_client.post(urls['delete_post'])
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert not Comment.objects.filter(post_id=post.pk).exists()
+
+
+def test_author_deletes_comment(author_client, urls, post, comment):
+    count = Post.objects.get(pk=post.pk).comment_count
+    author_client.post(urls['delete_comment'])
+    assert not Comment.objects.filter(pk=comment.pk).exists()
+    assert Post.objects.get(pk=post.pk).comment_count == count - 1
+
+
+@pytest.mark.parametrize('name', ['edit_post', 'delete_post'])
+def test_missing_post_is_not_found(author_client, name):
+    response = author_client.get(reverse(f'blog:{name}', args=[0]))
+    assert response.status_code == 404
+
+
+def test_failed_post_delete_keeps_comment_counter(post, comment):
+    def fail(sender, **kwargs):
+        raise RuntimeError('Удаление прервано')
+
+    post_delete.connect(fail, sender=Post)
+    try:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            post.delete()
+    finally:
+        post_delete.disconnect(fail, sender=Post)
+    assert deleting_posts.get() is None
+    count = Post.objects.get(pk=post.pk).comment_count
+    comment.delete()
+    assert Post.objects.get(pk=post.pk).comment_count == count - 1
@@ -0,0 +1,38 @@
+import pytest
+from django.urls import reverse
+
+from blog.middleware import QueryBudgetExceeded
+from blog.models import Comment
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize('comments', [0, 1, 30])
+def test_post_detail_queries_do_not_grow_with_comments(
+        client, post, author, comments, django_assert_num_queries):
+    Comment.objects.bulk_create(
+        Comment(post=post, author=author, text=str(number))
+        for number in range(comments)
+    )
+    url = reverse('blog:post_detail', args=[post.pk])
+    # Водяной знак ETag, пост со связанными объектами, страница
+    # комментариев.
+    with django_assert_num_queries(3):
+        response = client.get(url)
+    assert response.status_code == 200
+
+
+def test_post_detail_queries_for_author(
+        author_client, post, many_comments, django_assert_num_queries):
+    url = reverse('blog:post_detail', args=[post.pk])
+    # Плюс сессия и пользователь.
+    with django_assert_num_queries(4):
+        response = author_client.get(url)
+    assert response.status_code == 200
+    assert len(response.context['comments']) == 20
+
+
+def test_query_budget_is_enforced(client, post, many_comments, settings):
+    settings.QUERY_BUDGETS = {'blog:post_detail': 2}
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(reverse('blog:post_detail', args=[post.pk]))
@@ -0,0 +1,44 @@
+import pytest
+
+from blog.cache import get_generation
+from blog.images import mark_variants_failed
+from blog.templatetags.post_images import post_image
+
+pytestmark = pytest.mark.django_db
+
+VARIANTS = {
+    'source': 'posts_images/old.jpg',
+    'width': 960,
+    'height': 640,
+    'images': [{
+        'width': 320,
+        'fallback': 'posts_images/variants/old-320.jpg',
+        'webp': 'posts_images/variants/old-320.webp',
+    }],
+}
+
+
+def test_current_variants_are_used(post):
+    post.image = 'posts_images/old.jpg'
+    post.image_variants = VARIANTS
+    context = post_image(post)
+    assert 'old-320.jpg' in context['src']
+    assert not context['failed']
+
+
+def test_outdated_variants_are_pending(post):
+    post.image = 'posts_images/new.jpg'
+    post.image_variants = {**VARIANTS, 'failed': True}
+    context = post_image(post)
+    assert 'srcset' not in context
+    assert not context['failed']
+
+
+def test_storing_variants_resets_feed_cache(post):
+    post.image = 'posts_images/photo.jpg'
+    generation = get_generation()
+    mark_variants_failed(post)
+    assert get_generation() != generation
+    post.refresh_from_db()
+    assert post.image_variants == {
+        'source': 'posts_images/photo.jpg', 'failed': True}
@@ -0,0 +1,27 @@
+import pytest
+from django.core.cache import caches
+
+from blog.models import Post
+from blog.routers import ReplicaRouter, begin_request, end_request, get_state
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def state():
+    token = begin_request()
+    yield get_state()
+    end_request(token)
+
+
+def test_cache_write_does_not_pin(state):
+    model = caches['shared'].cache_model_class
+    assert ReplicaRouter().db_for_write(model) == 'default'
+    assert not state.pinned
+    assert not state.written
+
+
+def test_blog_write_pins(state):
+    ReplicaRouter().db_for_write(Post)
+    assert state.pinned
+    assert state.written